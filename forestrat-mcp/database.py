@@ -2,24 +2,81 @@
 DuckDB Connection Manager for Forestrat MCP Server
 
 This module provides a persistent connection to the DuckDB database
-to avoid reconnecting for every query.
+to avoid reconnecting for every query. Queries run on cursors borrowed
+from a small pool so concurrent callers do not share one handle.
 """
 
+import asyncio
+import concurrent.futures
 import duckdb
 import pandas as pd
+import pyarrow as pa
 import logging
-from typing import Any, Dict, List, Optional
+import os
+import queue
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Set, TypeVar
 from pathlib import Path
 import atexit
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Number of cursors handed out concurrently by DuckDBConnection; one per core, at least two
+DEFAULT_POOL_SIZE = max(2, os.cpu_count() or 1)
+
+# Rows per Arrow record batch handed out by stream_query_async
+DEFAULT_BATCH_ROWS = 10_000
+
+# Tables remembered by each of the DESCRIBE and column caches, least recently used evicted first
+SCHEMA_CACHE_SIZE = 256
+
+def quote_table_name(table_name: str) -> str:
+    """Double-quote a table name, and its schema if qualified, for DuckDB"""
+    return ".".join('"' + part.replace('"', '""') + '"' for part in table_name.split('.', 1))
+
+def _read_next_batch(reader: pa.RecordBatchReader) -> Optional[pa.RecordBatch]:
+    """Next batch from an Arrow reader, or None once exhausted.
+    
+    StopIteration cannot cross an executor future, so the end of the stream becomes None.
+    """
+    try:
+        return reader.read_next_batch()
+    except StopIteration:
+        return None
+
+def _on_event_loop_thread() -> bool:
+    """True when called from a thread that is running an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
 class DuckDBConnection:
     """Persistent DuckDB connection manager"""
     
-    def __init__(self, database_path: str):
+    def __init__(self, database_path: str, pool_size: int = DEFAULT_POOL_SIZE):
         self.database_path = Path(database_path).resolve()
         self._connection = None
+        self.pool_size = pool_size
+        self._cursor_pool: queue.LifoQueue = queue.LifoQueue()
+        # Every cursor counted against pool_size, idle or checked out, so close() reaches them all
+        self._pool_cursors: Set[duckdb.DuckDBPyConnection] = set()
+        # One-off cursors for synchronous callers on the event-loop thread (see _checkout_cursor)
+        self._extra_cursors: Set[duckdb.DuckDBPyConnection] = set()
+        self._pool_lock = threading.Lock()
+        # Blocking DuckDB work from async callers runs on this executor, one worker per cursor.
+        # Async callers take a slot first, so every slot holder can always get a worker thread.
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._async_slots = asyncio.Semaphore(pool_size)
+        # table name -> DESCRIBE rows, bounded by SCHEMA_CACHE_SIZE; this server never alters
+        # table definitions. Filled from executor threads, hence the lock.
+        self._describe_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._columns_cache: Dict[str, Dict[str, str]] = {}
+        self._schema_cache_lock = threading.Lock()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
         # Ensure database exists
@@ -67,16 +124,129 @@ class DuckDBConnection:
         except Exception as e:
             self.logger.warning(f"Could not configure connection settings: {e}")
     
-    def execute_query(self, query: str) -> pd.DataFrame:
+    def _checkout_cursor(self) -> duckdb.DuckDBPyConnection:
+        """Take an idle cursor, create one if under pool_size, or wait for a release"""
+        try:
+            return self._cursor_pool.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._pool_lock:
+            if len(self._pool_cursors) < self.pool_size:
+                cursor = self.connection.cursor()
+                self._pool_cursors.add(cursor)
+                return cursor
+            if _on_event_loop_thread():
+                # The async holders can only release once this thread's loop runs again, so
+                # waiting here would deadlock; use a cursor outside the pool instead
+                cursor = self.connection.cursor()
+                self._extra_cursors.add(cursor)
+                self.logger.debug("Cursor pool exhausted on the event-loop thread, using an extra cursor")
+                return cursor
+        
+        return self._cursor_pool.get()
+    
+    def _release_cursor(self, cursor: duckdb.DuckDBPyConnection):
+        """Return a pooled cursor to the pool; close extra cursors and ones orphaned by close()"""
+        with self._pool_lock:
+            pooled = cursor in self._pool_cursors
+            self._extra_cursors.discard(cursor)
+        if pooled:
+            self._cursor_pool.put(cursor)
+            return
+        try:
+            cursor.close()
+        except Exception:
+            pass
+    
+    @contextmanager
+    def acquire_cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow a cursor from the pool for the duration of the block"""
+        cursor = self._checkout_cursor()
+        try:
+            yield cursor
+        finally:
+            self._release_cursor(cursor)
+    
+    def _submit(self, func: Callable[..., T], *args: Any) -> "asyncio.Future[T]":
+        """Schedule a blocking call on the connection's executor (caller must hold a slot)"""
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="duckdb"
+            )
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    async def run_in_executor(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking DuckDB call off the event loop"""
+        async with self._async_slots:
+            return await self._submit(func, *args)
+    
+    @asynccontextmanager
+    async def acquire_cursor_async(self) -> AsyncIterator[duckdb.DuckDBPyConnection]:
+        """Borrow a pooled cursor without blocking the event loop while the pool is exhausted"""
+        async with self._async_slots:
+            cursor = await self._submit(self._checkout_cursor)
+            try:
+                yield cursor
+            finally:
+                self._release_cursor(cursor)
+    
+    def execute_query(self, query: str, params: Optional[Sequence[Any]] = None) -> pd.DataFrame:
         """Execute a SQL query and return results as DataFrame"""
         try:
-            result = self.connection.execute(query).df()
+            with self.acquire_cursor() as cursor:
+                result = cursor.execute(query, params).df()
             self.logger.debug(f"Query executed successfully, returned {len(result)} rows")
             return result
         except Exception as e:
             self.logger.error(f"Query execution failed: {query[:100]}... Error: {e}")
             raise
     
+    async def execute_query_async(self, query: str, params: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+        """Execute a SQL query on a worker thread so the event loop stays responsive"""
+        return await self.run_in_executor(self.execute_query, query, params)
+    
+    def execute_query_arrow(self, query: str, params: Optional[Sequence[Any]] = None) -> pa.Table:
+        """Execute a SQL query and return results as an Arrow table, without a pandas round trip"""
+        try:
+            with self.acquire_cursor() as cursor:
+                result = cursor.execute(query, params).fetch_arrow_table()
+            self.logger.debug(f"Query executed successfully, returned {result.num_rows} rows")
+            return result
+        except Exception as e:
+            self.logger.error(f"Query execution failed: {query[:100]}... Error: {e}")
+            raise
+    
+    async def execute_query_arrow_async(self, query: str, params: Optional[Sequence[Any]] = None) -> pa.Table:
+        """Execute a SQL query on a worker thread and return results as an Arrow table"""
+        return await self.run_in_executor(self.execute_query_arrow, query, params)
+    
+    async def stream_query_async(self, query: str, params: Optional[Sequence[Any]] = None,
+                                 batch_size: int = DEFAULT_BATCH_ROWS) -> AsyncIterator[pa.RecordBatch]:
+        """Execute a SQL query and yield Arrow record batches as DuckDB produces them.
+        
+        The borrowed cursor is held until iteration finishes. An empty result still yields
+        one zero-row batch so callers always see the column names.
+        """
+        async with self.acquire_cursor_async() as cursor:
+            try:
+                reader = await self._submit(
+                    lambda: cursor.execute(query, params).fetch_record_batch(batch_size)
+                )
+                batch_count = 0
+                while True:
+                    batch = await self._submit(_read_next_batch, reader)
+                    if batch is None:
+                        break
+                    batch_count += 1
+                    yield batch
+                if batch_count == 0:
+                    yield pa.RecordBatch.from_pylist([], schema=reader.schema)
+                self.logger.debug(f"Query streamed successfully in {batch_count} batches")
+            except Exception as e:
+                self.logger.error(f"Query execution failed: {query[:100]}... Error: {e}")
+                raise
+    
     def execute_sql(self, sql: str) -> Any:
         """Execute a SQL statement (non-query)"""
         try:
@@ -87,17 +257,44 @@ class DuckDBConnection:
             self.logger.error(f"SQL execution failed: {sql[:100]}... Error: {e}")
             raise
     
+    def _cache_get(self, cache: Dict[str, T], table_name: str) -> Optional[T]:
+        """Look up a schema cache entry, marking it most recently used"""
+        with self._schema_cache_lock:
+            entry = cache.pop(table_name, None)
+            if entry is not None:
+                cache[table_name] = entry
+            return entry
+    
+    def _cache_put(self, cache: Dict[str, T], table_name: str, entry: T):
+        """Remember a schema cache entry, evicting the least recently used beyond SCHEMA_CACHE_SIZE"""
+        with self._schema_cache_lock:
+            cache.pop(table_name, None)
+            cache[table_name] = entry
+            if len(cache) > SCHEMA_CACHE_SIZE:
+                del cache[next(iter(cache))]
+    
+    def describe_table(self, table_name: str) -> List[Dict[str, Any]]:
+        """DESCRIBE rows for a table, cached per table name; callers must not mutate them"""
+        rows = self._cache_get(self._describe_cache, table_name)
+        if rows is None:
+            # The name is quoted, so it can only ever name a table
+            rows = self.execute_query_arrow(f"DESCRIBE {quote_table_name(table_name)}").to_pylist()
+            self._cache_put(self._describe_cache, table_name, rows)
+        return rows
+    
     def get_table_columns(self, table_name: str) -> Dict[str, str]:
-        """Get column information for a table"""
+        """Get column information for a table, cached per table name; callers must not mutate it"""
+        column_dict = self._cache_get(self._columns_cache, table_name)
+        if column_dict is not None:
+            return column_dict
         try:
-            result = self.execute_query(f"DESCRIBE {table_name}")
-            
             # Convert to a dictionary mapping column_name -> column_type
             column_dict = {}
-            for row in result.to_dict('records'):
+            for row in self.describe_table(table_name):
                 column_dict[row['column_name']] = row['column_type']
             
             logger.info(f"Retrieved columns for {table_name}: {len(column_dict)} columns")
+            self._cache_put(self._columns_cache, table_name, column_dict)
             return column_dict
             
         except Exception as e:
@@ -115,14 +312,16 @@ class DuckDBConnection:
                 FROM information_schema.tables 
                 WHERE table_schema = ? AND table_name = ?
                 """
-                result = self.connection.execute(query, [schema, table]).fetchone()
+                with self.acquire_cursor() as cursor:
+                    result = cursor.execute(query, [schema, table]).fetchone()
             else:
                 query = """
                 SELECT COUNT(*) as count
                 FROM information_schema.tables 
                 WHERE table_name = ?
                 """
-                result = self.connection.execute(query, [table_name]).fetchone()
+                with self.acquire_cursor() as cursor:
+                    result = cursor.execute(query, [table_name]).fetchone()
             
             return result[0] > 0
         except Exception as e:
@@ -139,16 +338,16 @@ class DuckDBConnection:
             
             if info["exists"]:
                 # Get schema
-                schema_result = self.execute_query(f"DESCRIBE {table_name}")
-                info["columns"] = schema_result.to_dict('records')
+                info["columns"] = self.describe_table(table_name)
                 
                 # Get row count
-                count_result = self.execute_query(f"SELECT COUNT(*) as count FROM {table_name}")
-                info["row_count"] = int(count_result.iloc[0]['count'])
+                quoted = quote_table_name(table_name)
+                count_result = self.execute_query_arrow(f"SELECT COUNT(*) as count FROM {quoted}")
+                info["row_count"] = count_result.column('count')[0].as_py()
                 
                 # Get sample data
-                sample_result = self.execute_query(f"SELECT * FROM {table_name} LIMIT 3")
-                info["sample_data"] = sample_result.to_dict('records')
+                sample_result = self.execute_query_arrow(f"SELECT * FROM {quoted} LIMIT 3")
+                info["sample_data"] = sample_result.to_pylist()
             
             return info
         except Exception as e:
@@ -184,7 +383,8 @@ class DuckDBConnection:
     def test_connection(self) -> bool:
         """Test the database connection"""
         try:
-            result = self.connection.execute("SELECT 1 as test").fetchone()
+            with self.acquire_cursor() as cursor:
+                result = cursor.execute("SELECT 1 as test").fetchone()
             return result[0] == 1
         except Exception as e:
             self.logger.error(f"Connection test failed: {e}")
@@ -192,6 +392,26 @@ class DuckDBConnection:
     
     def close(self):
         """Close the database connection"""
+        # Checked-out cursors are closed too; releasing one afterwards just closes it again
+        with self._pool_lock:
+            cursors = self._pool_cursors | self._extra_cursors
+            self._pool_cursors.clear()
+            self._extra_cursors.clear()
+            while True:
+                try:
+                    self._cursor_pool.get_nowait()
+                except queue.Empty:
+                    break
+        for cursor in cursors:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        
         if self._connection:
             try:
                 self._connection.close()
@@ -82,7 +82,7 @@ async def demo_mcp_tools():
             GROUP BY exchange
             ORDER BY total_records DESC
             """
-            result = await server._query_data(query, limit=10)
+            result = json.loads(await server._query_data(query, limit=10))
             print("Query results:")
             for row in result['data']:
                 print(f"  {row['exchange']}: {row['unique_symbols']} symbols, {row['total_records']:,} records")
@@ -93,12 +93,12 @@ async def demo_mcp_tools():
         print("\n6. Getting data for time range from LSE...")
         try:
             # Use the actual date where data exists (2025-02-19)
-            data = await server._get_data_for_time_range(
+            data = json.loads(await server._get_data_for_time_range(
                 dataset="lse",  # Use 'lse' which maps to bronze.lse_market_data
                 start_date="2025-02-19",
                 end_date="2025-02-19",  # Single day where data exists
                 limit=3
-            )
+            ))
             print(f"Retrieved {data['record_count']} records from {data['table']}")
             print(f"Date range: {data['start_date']} to {data['end_date']}")
             if data['data']:
@@ -155,7 +155,7 @@ async def demo_mcp_tools():
             ORDER BY trade_count DESC
             LIMIT 5
             """
-            result = await server._query_data(query, limit=5)
+            result = json.loads(await server._query_data(query, limit=5))
             print("Top 5 most traded symbols:")
             for row in result['data']:
                 print(f"  {row['symbol']}: {row['trade_count']:,} trades, avg price: ${row['avg_price']:.2f}")
@@ -2,12 +2,13 @@
 """
 Standalone Category Data Exporter
 
-Export all data for specific futures categories to CSV or JSON files.
+Export all data for specific futures categories to CSV, JSON or Parquet files.
 This script can be run independently of the MCP server.
 
 Usage:
     python export_category_data.py --category bitcoin_futures --exchange CME
     python export_category_data.py --category crypto_futures --exchange CME --start-date 2025-01-01 --format json
+    python export_category_data.py --category crypto_futures --exchange CME --format parquet
 """
 
 import argparse
@@ -15,7 +16,7 @@ import os
 import sys
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -30,6 +31,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Exchange code -> raw bronze table the exporter reads from
+EXCHANGE_TABLES = {
+    'LSE': 'bronze.lse_market_data_raw',
+    'CME': 'bronze.cme_market_data_raw',
+    'NYQ': 'bronze.nyq_market_data_raw'
+}
+
 # Import symbol categories
 SYMBOL_CATEGORIES = {
     "bitcoin_futures": {
@@ -76,6 +84,58 @@ SYMBOL_CATEGORIES = {
     }
 }
 
+# DuckDB COPY options per export format; rows go from the query straight to disk
+EXPORT_COPY_OPTIONS = {
+    "csv": "FORMAT CSV, HEADER",
+    "json": "FORMAT JSON, ARRAY true",
+    "parquet": "FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 122880"
+}
+
+NUMERIC_COLUMN_TYPES = ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'FLOAT', 'DOUBLE', 'DECIMAL')
+
+
+def _is_numeric_type(column_type: Optional[str]) -> bool:
+    """Check a DuckDB column type name (e.g. 'DECIMAL(21,1)') against NUMERIC_COLUMN_TYPES"""
+    return bool(column_type) and column_type.split('(', 1)[0] in NUMERIC_COLUMN_TYPES
+
+
+def _summarize_export_query(db: DuckDBConnection, query: str, params: List[Any], table_name: str) -> dict:
+    """Compute export summary statistics in DuckDB instead of over a DataFrame"""
+    columns = db.get_table_columns(table_name)
+    total_volume = "CAST(SUM(Volume) AS DOUBLE)" if _is_numeric_type(columns.get('Volume')) else "NULL"
+    avg_price = "CAST(AVG(Price) AS DOUBLE)" if _is_numeric_type(columns.get('Price')) else "NULL"
+    
+    stats_query = f"""
+    SELECT 
+        COUNT(*) as total_records,
+        COUNT(DISTINCT symbol) as unique_symbols,
+        list_sort(list(DISTINCT symbol)) as symbols_found,
+        CAST(MIN(data_date) AS TIMESTAMP) as earliest,
+        CAST(MAX(data_date) AS TIMESTAMP) as latest,
+        COUNT(DISTINCT data_date) as unique_dates,
+        {total_volume} as total_volume,
+        {avg_price} as avg_price
+    FROM ({query})
+    """
+    with db.acquire_cursor() as cursor:
+        row = cursor.execute(stats_query, params).fetchone()
+    
+    (total_records, unique_symbols, symbols_found, earliest, latest,
+     unique_dates, volume_sum, price_avg) = row
+    return {
+        "total_records": total_records,
+        "unique_symbols": unique_symbols,
+        "symbols_found": symbols_found or [],
+        "date_range": {
+            "earliest": str(earliest),
+            "latest": str(latest)
+        },
+        "unique_dates": unique_dates,
+        "total_volume": volume_sum if total_volume != "NULL" else "N/A",
+        "avg_price": price_avg if avg_price != "NULL" else "N/A"
+    }
+
+
 def export_category_data(
     category: str,
     exchange: str,
@@ -110,17 +170,11 @@ def export_category_data(
         # Initialize database connection
         db = DuckDBConnection(database_path)
         
-        table_mapping = {
-            'LSE': 'bronze.lse_market_data_raw',
-            'CME': 'bronze.cme_market_data_raw',
-            'NYQ': 'bronze.nyq_market_data_raw'
-        }
-        
-        table_name = table_mapping.get(exchange)
+        table_name = EXCHANGE_TABLES.get(exchange)
         if not table_name:
             return {
                 "error": f"No table found for exchange {exchange}",
-                "available_exchanges": list(table_mapping.keys())
+                "available_exchanges": list(EXCHANGE_TABLES)
             }
         
         if not db.table_exists(table_name):
@@ -128,16 +182,16 @@ def export_category_data(
                 "error": f"Table {table_name} does not exist"
             }
         
-        # Build the query to get ALL raw data for the category symbols
-        symbol_list = "', '".join(symbols)
-        
-        # Build WHERE clause
-        where_clauses = [f"\"#RIC\" IN ('{symbol_list}')"]
+        # Build WHERE clause; the symbol list is bound as one VARCHAR[] so DuckDB hashes it
+        where_clauses = ['"#RIC" IN (SELECT unnest(?::VARCHAR[]))']
+        params: List[Any] = [symbols]
         
         if start_date:
-            where_clauses.append(f"data_date >= '{start_date}'")
+            where_clauses.append("data_date >= ?")
+            params.append(start_date)
         if end_date:
-            where_clauses.append(f"data_date <= '{end_date}'")
+            where_clauses.append("data_date <= ?")
+            params.append(end_date)
         
         where_clause = " AND ".join(where_clauses)
         
@@ -160,9 +214,10 @@ def export_category_data(
         logger.info(f"Executing export query for {category} on {exchange}")
         logger.info(f"Query: {query}")
         
-        result_df = db.execute_query(query)
+        # DuckDB computes the summary and writes the file itself; no DataFrame is built
+        summary_stats = _summarize_export_query(db, query, params, table_name)
         
-        if result_df.empty:
+        if summary_stats["total_records"] == 0:
             return {
                 "error": "No data found for the specified criteria",
                 "category": category,
@@ -199,26 +254,11 @@ def export_category_data(
         output_path = os.path.join(output_dir, output_filename)
         
         # Export the data
-        logger.info(f"Exporting {len(result_df)} records to {output_path}")
-        
-        if format == "json":
-            result_df.to_json(output_path, orient='records', date_format='iso', indent=2)
-        else:  # Default to CSV
-            result_df.to_csv(output_path, index=False)
-        
-        # Calculate summary statistics
-        summary_stats = {
-            "total_records": len(result_df),
-            "unique_symbols": result_df['symbol'].nunique(),
-            "symbols_found": sorted(result_df['symbol'].unique().tolist()),
-            "date_range": {
-                "earliest": str(result_df['data_date'].min()),
-                "latest": str(result_df['data_date'].max())
-            },
-            "unique_dates": result_df['data_date'].nunique(),
-            "total_volume": result_df['Volume'].sum() if result_df['Volume'].dtype in ['int64', 'float64'] else "N/A",
-            "avg_price": result_df['Price'].mean() if result_df['Price'].dtype in ['int64', 'float64'] else "N/A"
-        }
+        logger.info(f"Exporting {summary_stats['total_records']} records to {output_path}")
+        copy_options = EXPORT_COPY_OPTIONS.get(format, EXPORT_COPY_OPTIONS["csv"])  # Default to CSV
+        escaped_path = output_path.replace("'", "''")
+        with db.acquire_cursor() as cursor:
+            cursor.execute(f"COPY ({query}) TO '{escaped_path}' ({copy_options})", params)
         
         file_size_mb = round(os.path.getsize(output_path) / (1024 * 1024), 2)
         
@@ -246,15 +286,14 @@ def export_category_data(
         }
         
     except Exception as e:
-        logger.error(f"Error exporting category data: {e}")
-        import traceback
-        logger.error(f"Export error traceback: {traceback.format_exc()}")
+        # The traceback is only formatted if a handler actually emits the record
+        logger.exception("Error exporting category data: %s", e)
         return {"error": str(e)}
 
 def main():
     """Main entry point for the script"""
     parser = argparse.ArgumentParser(
-        description="Export futures category data to CSV or JSON files"
+        description="Export futures category data to CSV, JSON or Parquet files"
     )
     
     parser.add_argument(
@@ -292,7 +331,7 @@ def main():
     
     parser.add_argument(
         "--format",
-        choices=["csv", "json"],
+        choices=["csv", "json", "parquet"],
         default="csv",
         help="Export format (default: csv)"
     )
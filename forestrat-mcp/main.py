@@ -8,8 +8,9 @@ This MCP server provides tools to interact with the multi-exchange market data s
 import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
 from datetime import datetime, date
+from decimal import Decimal
 import sys
 from pathlib import Path
 
@@ -24,7 +25,8 @@ from mcp.types import (
     TextContent,
     Tool
 )
-from database import DuckDBConnection
+import pyarrow as pa
+from database import DuckDBConnection, quote_table_name
 from pydantic import BaseModel
 
 # Set up logging
@@ -34,6 +36,123 @@ logging.basicConfig(
 )
 logger = logging.getLogger("forestrat-mcp")
 
+# Exchange code -> bronze table for the symbol-level tools
+EXCHANGE_TABLES = {
+    'LSE': 'bronze.lse_market_data',
+    'CME': 'bronze.cme_market_data',
+    'NYQ': 'bronze.nyq_market_data'
+}
+# Common dataset names -> tables; anything else is used as the table name as given
+DATASET_TABLES = {
+    'lse': 'bronze.lse_market_data',
+    'cme': 'bronze.cme_market_data',
+    'nyq': 'bronze.nyq_market_data',
+    'unified': 'silver.market_data_unified',
+    'market_data': 'silver.market_data_unified',
+    'timeseries': 'silver.price_timeseries',
+    'daily_summary': 'gold.daily_market_summary',
+    'arbitrage': 'gold.arbitrage_opportunities'
+}
+# Volume column types that can be summed/averaged; anything else falls back to trade counts
+NUMERIC_VOLUME_TYPES = frozenset({'BIGINT', 'INTEGER', 'DOUBLE'})
+
+# Table names cannot be bound, so only they are formatted in, always through
+# quote_table_name; every value is a parameter. The statement text is identical across calls for a table.
+TIME_RANGE_QUERY = """
+SELECT {columns}
+FROM {table_name}
+WHERE data_date BETWEEN ? AND ?
+ORDER BY data_date, "Date-Time" LIMIT ?
+"""
+TIME_RANGE_EXCHANGE_QUERY = """
+SELECT {columns}
+FROM {table_name}
+WHERE data_date BETWEEN ? AND ? AND exchange = ?
+ORDER BY data_date, "Date-Time" LIMIT ?
+"""
+# Columns get_data_for_time_range returns when the caller does not pick any; only the
+# ones a table actually has are selected, so DuckDB skips reading the rest
+TIME_RANGE_DEFAULT_COLUMNS = ('data_date', 'Date-Time', '#RIC', 'Price', 'Volume', 'exchange')
+# Shared by the most/least active tools; formatted once per table, metric and sort direction
+ACTIVE_SYMBOLS_QUERY = """
+SELECT 
+    "#RIC" as symbol,
+    {select_metric},
+    AVG(Price) as avg_price,
+    MIN(Price) as min_price,
+    MAX(Price) as max_price,
+    COUNT(*) as trade_count
+FROM {table_name}
+WHERE data_date = ?
+GROUP BY "#RIC"
+ORDER BY {order_by}
+LIMIT ?
+"""
+
+
+def _quote_identifier(name: str) -> str:
+    """Double-quote a column or schema name for DuckDB"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _json_default(value: Any) -> Any:
+    """json.dumps fallback: DECIMAL columns stay numbers, everything else is stringified"""
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    """Compact JSON text for a tool result"""
+    return json.dumps(value, separators=(',', ':'), default=_json_default)
+
+
+async def _encode_batches(batches: AsyncIterator[pa.RecordBatch]) -> Tuple[int, List[str], str]:
+    """Encode record batches to JSON as they arrive; returns (row count, column names, JSON array).
+    
+    Only the encoded text of a batch outlives it, so the rows are never all held as Python objects.
+    """
+    record_count = 0
+    columns: List[str] = []
+    parts = []
+    async for batch in batches:
+        columns = batch.schema.names
+        if batch.num_rows:
+            record_count += batch.num_rows
+            parts.append(_dumps(batch.to_pylist())[1:-1])
+    return record_count, columns, "[" + ",".join(parts) + "]"
+
+
+def _with_data(result: Dict[str, Any], data_json: str) -> str:
+    """JSON text of result with an already-encoded "data" array as its last key"""
+    return _dumps(result)[:-1] + ',"data":' + data_json + '}'
+
+
+class ToolSpec(NamedTuple):
+    """Dispatch entry for a call_tool handler"""
+    method: str  # ForestratMCPServer coroutine method name
+    required: Tuple[str, ...] = ()
+    optional: Tuple[Tuple[str, Any], ...] = ()
+
+
+# call_tool name -> server method and argument layout
+TOOL_DISPATCH: Dict[str, ToolSpec] = {
+    "list_datasets": ToolSpec("_list_datasets", (), (("include_stats", False),)),
+    "get_dataset_exchanges": ToolSpec("_get_dataset_exchanges", ("dataset",)),
+    "get_data_for_time_range": ToolSpec(
+        "_get_data_for_time_range", ("dataset", "start_date", "end_date"),
+        (("exchange", None), ("limit", 1000), ("columns", None))),
+    "query_data": ToolSpec("_query_data", ("query",), (("limit", 1000),)),
+    "get_table_schema": ToolSpec("_get_table_schema", ("table_name",)),
+    "get_available_symbols": ToolSpec(
+        "_get_available_symbols", ("exchange",), (("start_date", None), ("end_date", None))),
+    "get_most_active_symbols": ToolSpec(
+        "_get_most_active_symbols", ("date", "exchange"), (("metric", "trade_count"), ("limit", 10))),
+    "get_least_active_symbols": ToolSpec(
+        "_get_least_active_symbols", ("date", "exchange"), (("metric", "trade_count"), ("limit", 10))),
+}
+
+
 class ForestratMCPServer:
     """MCP Server for Forestrat DuckDB Data Lake"""
     
@@ -44,6 +163,8 @@ class ForestratMCPServer:
         
         self.server = Server("forestrat-mcp")
         self.db = DuckDBConnection(database_path)
+        # (table, by volume, sort direction) -> (query text, whether it sums Volume)
+        self._active_queries: Dict[Tuple[str, bool, str], Tuple[str, bool]] = {}
         self._setup_tools()
         
     def _setup_tools(self):
@@ -109,6 +230,11 @@ class ForestratMCPServer:
                                 "limit": {
                                     "type": "integer",
                                     "description": "Maximum number of records to return"
+                                },
+                                "columns": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "Columns to return (defaults to date, time, symbol, price, volume and exchange)"
                                 }
                             },
                             "required": ["dataset", "start_date", "end_date"],
@@ -213,53 +339,20 @@ class ForestratMCPServer:
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
             """Handle tool calls"""
             try:
-                if name == "list_datasets":
-                    result = await self._list_datasets(arguments.get("include_stats", False))
-                elif name == "get_dataset_exchanges":
-                    result = await self._get_dataset_exchanges(arguments["dataset"])
-                elif name == "get_data_for_time_range":
-                    result = await self._get_data_for_time_range(
-                        arguments["dataset"],
-                        arguments["start_date"],
-                        arguments["end_date"],
-                        arguments.get("exchange"),
-                        arguments.get("limit", 1000)
-                    )
-                elif name == "query_data":
-                    result = await self._query_data(
-                        arguments["query"],
-                        arguments.get("limit", 1000)
-                    )
-                elif name == "get_table_schema":
-                    result = await self._get_table_schema(arguments["table_name"])
-                elif name == "get_available_symbols":
-                    result = await self._get_available_symbols(
-                        arguments["exchange"],
-                        arguments.get("start_date"),
-                        arguments.get("end_date")
-                    )
-                elif name == "get_most_active_symbols":
-                    result = await self._get_most_active_symbols(
-                        arguments["date"],
-                        arguments["exchange"],
-                        arguments.get("metric", "trade_count"),
-                        arguments.get("limit", 10)
-                    )
-                elif name == "get_least_active_symbols":
-                    result = await self._get_least_active_symbols(
-                        arguments["date"],
-                        arguments["exchange"],
-                        arguments.get("metric", "trade_count"),
-                        arguments.get("limit", 10)
-                    )
-                else:
+                spec = TOOL_DISPATCH.get(name)
+                if spec is None:
                     return CallToolResult(
                         content=[TextContent(type="text", text=f"Unknown tool: {name}")],
                         isError=True
                     )
+                args = [arguments[key] for key in spec.required]
+                args.extend(arguments.get(key, default) for key, default in spec.optional)
+                result = await getattr(self, spec.method)(*args)
+                # Streaming tools hand back their result already encoded
+                text = result if isinstance(result, str) else _dumps(result)
                     
                 return CallToolResult(
-                    content=[TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+                    content=[TextContent(type="text", text=text)]
                 )
                 
             except Exception as e:
@@ -283,7 +376,7 @@ class ForestratMCPServer:
             ORDER BY table_schema, table_name
             """
             
-            tables = self.db.execute_query(tables_query)
+            tables = await self.db.execute_query_arrow_async(tables_query)
             
             datasets = {
                 "vendor": "LSEG/TRTH",
@@ -291,7 +384,7 @@ class ForestratMCPServer:
                 "schemas": {}
             }
             
-            for _, row in tables.iterrows():
+            for row in tables.to_pylist():
                 schema = row['table_schema']
                 table = row['table_name']
                 
@@ -310,20 +403,20 @@ class ForestratMCPServer:
                 if include_stats:
                     # Get record count and date range
                     try:
-                        if 'data_date' in self.db.get_table_columns(f"{schema}.{table}"):
+                        if 'data_date' in await self.db.run_in_executor(self.db.get_table_columns, f"{schema}.{table}"):
                             stats_query = f"""
                             SELECT 
                                 COUNT(*) as record_count,
                                 MIN(data_date) as earliest_date,
                                 MAX(data_date) as latest_date
-                            FROM {schema}.{table}
+                            FROM {_quote_identifier(schema)}.{_quote_identifier(table)}
                             """
-                            stats = self.db.execute_query(stats_query)
-                            if not stats.empty:
+                            stats = (await self.db.execute_query_arrow_async(stats_query)).to_pylist()
+                            if stats:
                                 table_info["stats"] = {
-                                    "record_count": int(stats.iloc[0]['record_count']),
-                                    "earliest_date": str(stats.iloc[0]['earliest_date']),
-                                    "latest_date": str(stats.iloc[0]['latest_date'])
+                                    "record_count": stats[0]['record_count'],
+                                    "earliest_date": str(stats[0]['earliest_date']),
+                                    "latest_date": str(stats[0]['latest_date'])
                                 }
                     except Exception as e:
                         logger.warning(f"Could not get stats for {schema}.{table}: {e}")
@@ -343,7 +436,7 @@ class ForestratMCPServer:
             table_name = self._resolve_table_name(dataset)
             
             # Check if table exists first
-            if not self.db.table_exists(table_name):
+            if not await self.db.run_in_executor(self.db.table_exists, table_name):
                 return {
                     "dataset": dataset,
                     "table": table_name,
@@ -353,7 +446,7 @@ class ForestratMCPServer:
                 }
             
             # Check if the table has an exchange column
-            columns = self.db.get_table_columns(table_name)
+            columns = await self.db.run_in_executor(self.db.get_table_columns, table_name)
             if 'exchange' not in columns:
                 return {
                     "dataset": dataset,
@@ -369,15 +462,15 @@ class ForestratMCPServer:
                 MIN(data_date) as earliest_date,
                 MAX(data_date) as latest_date,
                 COUNT(DISTINCT "#RIC") as unique_symbols
-            FROM {table_name}
+            FROM {quote_table_name(table_name)}
             GROUP BY exchange
             ORDER BY exchange
             """
             
-            result = self.db.execute_query(query)
+            result = await self.db.execute_query_arrow_async(query)
             
             exchanges = []
-            for _, row in result.iterrows():
+            for row in result.to_pylist():
                 exchanges.append({
                     "exchange": row['exchange'],
                     "record_count": int(row['record_count']),
@@ -402,55 +495,66 @@ class ForestratMCPServer:
         start_date: str, 
         end_date: str, 
         exchange: Optional[str] = None,
-        limit: int = 1000
-    ) -> Dict[str, Any]:
-        """Get data for a specific time range"""
+        limit: int = 1000,
+        columns: Optional[List[str]] = None
+    ) -> Union[Dict[str, Any], str]:
+        """Get data for a specific time range; the result comes back as JSON text"""
         try:
             table_name = self._resolve_table_name(dataset)
             
-            # Build the query
-            query = f"""
-            SELECT *
-            FROM {table_name}
-            WHERE data_date BETWEEN '{start_date}' AND '{end_date}'
-            """
+            # Project only the requested (or default) columns instead of SELECT *
+            table_columns = await self.db.run_in_executor(self.db.get_table_columns, table_name)
+            if columns:
+                unknown = [column for column in columns if column not in table_columns]
+                if unknown:
+                    return {
+                        "dataset": dataset,
+                        "table": table_name,
+                        "error": f"Unknown columns: {', '.join(unknown)}",
+                        "available_columns": list(table_columns)
+                    }
+                selected = columns
+            else:
+                selected = [column for column in TIME_RANGE_DEFAULT_COLUMNS if column in table_columns]
+            projection = ", ".join(map(_quote_identifier, selected)) if selected else "*"
             
             if exchange:
-                query += f" AND exchange = '{exchange}'"
-            
-            query += f" ORDER BY data_date, \"Date-Time\" LIMIT {limit}"
+                query = TIME_RANGE_EXCHANGE_QUERY.format(columns=projection, table_name=quote_table_name(table_name))
+                params = [start_date, end_date, exchange, limit]
+            else:
+                query = TIME_RANGE_QUERY.format(columns=projection, table_name=quote_table_name(table_name))
+                params = [start_date, end_date, limit]
             
-            result = self.db.execute_query(query)
+            # Each record batch is encoded as it arrives; no DataFrame or row list is built
+            record_count, _, data = await _encode_batches(self.db.stream_query_async(query, params))
             
-            return {
+            return _with_data({
                 "dataset": dataset,
                 "table": table_name,
                 "start_date": start_date,
                 "end_date": end_date,
                 "exchange": exchange,
-                "record_count": len(result),
-                "data": result.to_dict('records')
-            }
+                "record_count": record_count
+            }, data)
             
         except Exception as e:
             logger.error(f"Error getting data for time range: {e}")
             raise
     
-    async def _query_data(self, query: str, limit: int = 1000) -> Dict[str, Any]:
-        """Execute a SQL query"""
+    async def _query_data(self, query: str, limit: int = 1000) -> str:
+        """Execute a SQL query; the result comes back as JSON text"""
         try:
             # Add limit if not already present and it's a SELECT query
             if query.strip().upper().startswith('SELECT') and 'LIMIT' not in query.upper():
-                query += f" LIMIT {limit}"
+                query += f" LIMIT {int(limit)}"
             
-            result = self.db.execute_query(query)
+            record_count, columns, data = await _encode_batches(self.db.stream_query_async(query))
             
-            return {
+            return _with_data({
                 "query": query,
-                "record_count": len(result),
-                "columns": list(result.columns),
-                "data": result.to_dict('records')
-            }
+                "record_count": record_count,
+                "columns": columns
+            }, data)
             
         except Exception as e:
             logger.error(f"Error executing query: {e}")
@@ -459,18 +563,17 @@ class ForestratMCPServer:
     async def _get_table_schema(self, table_name: str) -> Dict[str, Any]:
         """Get table schema information"""
         try:
-            # Get column information
-            schema_query = f"DESCRIBE {table_name}"
-            schema_result = self.db.execute_query(schema_query)
+            # Get column information (cached by the connection after the first DESCRIBE)
+            columns = await self.db.run_in_executor(self.db.describe_table, table_name)
             
-            # Get sample data
-            sample_query = f"SELECT * FROM {table_name} LIMIT 5"
-            sample_result = self.db.execute_query(sample_query)
+            # Get sample data; the name is quoted like DESCRIBE's, so it can only name a table
+            sample_query = f"SELECT * FROM {quote_table_name(table_name)} LIMIT 5"
+            sample_result = await self.db.execute_query_arrow_async(sample_query)
             
             return {
                 "table_name": table_name,
-                "columns": schema_result.to_dict('records'),
-                "sample_data": sample_result.to_dict('records')
+                "columns": columns,
+                "sample_data": sample_result.to_pylist()
             }
             
         except Exception as e:
@@ -485,27 +588,21 @@ class ForestratMCPServer:
     ) -> Dict[str, Any]:
         """Get available symbols for an exchange"""
         try:
-            # Find the appropriate table for the exchange
-            table_mapping = {
-                'LSE': 'bronze.lse_market_data',
-                'CME': 'bronze.cme_market_data',
-                'NYQ': 'bronze.nyq_market_data'
-            }
-            
-            table_name = table_mapping.get(exchange.upper())
+            table_name = EXCHANGE_TABLES.get(exchange.upper())
             if not table_name:
                 return {
                     "exchange": exchange,
                     "error": f"No table found for exchange {exchange}",
-                    "available_exchanges": list(table_mapping.keys())
+                    "available_exchanges": list(EXCHANGE_TABLES)
                 }
             
             # Check column types to handle data type differences
-            columns = self.db.get_table_columns(table_name)
+            columns = await self.db.run_in_executor(self.db.get_table_columns, table_name)
             
             # Build query with appropriate type casting
-            volume_expr = "AVG(Volume)" if columns.get('Volume') in ['BIGINT', 'INTEGER', 'DOUBLE'] else "COUNT(*)"
-            volume_alias = "avg_volume" if columns.get('Volume') in ['BIGINT', 'INTEGER', 'DOUBLE'] else "volume_records"
+            numeric_volume = columns.get('Volume') in NUMERIC_VOLUME_TYPES
+            volume_expr = "AVG(Volume)" if numeric_volume else "COUNT(*)"
+            volume_alias = "avg_volume" if numeric_volume else "volume_records"
             
             query = f"""
             SELECT 
@@ -515,29 +612,32 @@ class ForestratMCPServer:
                 MAX(data_date) as last_seen,
                 AVG(Price) as avg_price,
                 {volume_expr} as {volume_alias}
-            FROM {table_name}
+            FROM {quote_table_name(table_name)}
             WHERE 1=1
             """
             
+            params = []
             if start_date:
-                query += f" AND data_date >= '{start_date}'"
+                query += " AND data_date >= ?"
+                params.append(start_date)
             if end_date:
-                query += f" AND data_date <= '{end_date}'"
+                query += " AND data_date <= ?"
+                params.append(end_date)
             
             query += """
             GROUP BY "#RIC"
             ORDER BY trade_count DESC, "#RIC"
             """
             
-            result = self.db.execute_query(query)
+            result = await self.db.execute_query_arrow_async(query, params)
             
             return {
                 "exchange": exchange,
                 "table": table_name,
                 "start_date": start_date,
                 "end_date": end_date,
-                "symbol_count": len(result),
-                "symbols": result.to_dict('records'),
+                "symbol_count": result.num_rows,
+                "symbols": result.to_pylist(),
                 "note": f"Volume data type: {columns.get('Volume', 'unknown')}"
             }
             
@@ -545,6 +645,82 @@ class ForestratMCPServer:
             logger.error(f"Error getting available symbols: {e}")
             raise
     
+    async def _active_symbols_query(
+        self,
+        table_name: str,
+        by_volume: bool,
+        direction: str
+    ) -> Optional[Tuple[str, bool]]:
+        """Build (once per table, metric and direction) the ranking query; None if the table is missing"""
+        key = (table_name, by_volume, direction)
+        cached = self._active_queries.get(key)
+        if cached is not None:
+            return cached
+        
+        if not await self.db.run_in_executor(self.db.table_exists, table_name):
+            return None
+        
+        # Use volume if requested and numeric, otherwise fall back to trade count
+        columns = await self.db.run_in_executor(self.db.get_table_columns, table_name)
+        uses_volume = by_volume and columns.get('Volume') in NUMERIC_VOLUME_TYPES
+        if uses_volume:
+            select_metric = "SUM(Volume) as total_volume"
+            order_by = f"total_volume {direction}"
+        else:
+            select_metric = "COUNT(*) as trade_count"
+            order_by = f"trade_count {direction}"
+        
+        cached = (
+            ACTIVE_SYMBOLS_QUERY.format(
+                table_name=quote_table_name(table_name), select_metric=select_metric, order_by=order_by
+            ),
+            uses_volume
+        )
+        self._active_queries[key] = cached
+        return cached
+    
+    async def _get_active_symbols(
+        self,
+        date: str,
+        exchange: str,
+        metric: str,
+        limit: int,
+        direction: str
+    ) -> Dict[str, Any]:
+        """Rank symbols by activity on a date; DESC gives the most active, ASC the least"""
+        table_name = EXCHANGE_TABLES.get(exchange.upper())
+        if not table_name:
+            return {
+                "date": date,
+                "exchange": exchange,
+                "error": f"No table found for exchange {exchange}",
+                "available_exchanges": list(EXCHANGE_TABLES)
+            }
+        
+        by_volume = metric == "volume"
+        prepared = await self._active_symbols_query(table_name, by_volume, direction)
+        if prepared is None:
+            return {
+                "date": date,
+                "exchange": exchange,
+                "error": f"Table {table_name} does not exist",
+                "symbols": []
+            }
+        query, uses_volume = prepared
+        if by_volume and not uses_volume:
+            metric = "trade_count"  # Update metric name for response
+        
+        result = await self.db.execute_query_arrow_async(query, [date, limit])
+        
+        return {
+            "date": date,
+            "exchange": exchange,
+            "metric": metric,
+            "symbol_count": result.num_rows,
+            "symbols": result.to_pylist(),
+            "note": f"{'Most' if direction == 'DESC' else 'Least'} active symbols by {metric}"
+        }
+    
     async def _get_most_active_symbols(
         self, 
         date: str, 
@@ -554,75 +730,7 @@ class ForestratMCPServer:
     ) -> Dict[str, Any]:
         """Get the most active symbols for a specific date"""
         try:
-            # Find the appropriate table for the exchange
-            table_mapping = {
-                'LSE': 'bronze.lse_market_data',
-                'CME': 'bronze.cme_market_data', 
-                'NYQ': 'bronze.nyq_market_data'
-            }
-            
-            table_name = table_mapping.get(exchange.upper())
-            if not table_name:
-                return {
-                    "date": date,
-                    "exchange": exchange,
-                    "error": f"No table found for exchange {exchange}",
-                    "available_exchanges": list(table_mapping.keys())
-                }
-            
-            # Check if table exists
-            if not self.db.table_exists(table_name):
-                return {
-                    "date": date,
-                    "exchange": exchange,
-                    "error": f"Table {table_name} does not exist",
-                    "symbols": []
-                }
-            
-            # Check column types to handle data type differences
-            columns = self.db.get_table_columns(table_name)
-            
-            # Build query based on metric type
-            if metric == "volume":
-                # Use volume if available and numeric
-                if columns.get('Volume') in ['BIGINT', 'INTEGER', 'DOUBLE']:
-                    order_by = "total_volume DESC"
-                    select_metric = "SUM(Volume) as total_volume"
-                else:
-                    # Fallback to trade count if volume is not numeric
-                    order_by = "trade_count DESC"
-                    select_metric = "COUNT(*) as trade_count"
-                    metric = "trade_count"  # Update metric name for response
-            else:
-                order_by = "trade_count DESC"
-                select_metric = "COUNT(*) as trade_count"
-            
-            query = f"""
-            SELECT 
-                "#RIC" as symbol,
-                {select_metric},
-                AVG(Price) as avg_price,
-                MIN(Price) as min_price,
-                MAX(Price) as max_price,
-                COUNT(*) as trade_count
-            FROM {table_name}
-            WHERE data_date = '{date}'
-            GROUP BY "#RIC"
-            ORDER BY {order_by}
-            LIMIT {limit}
-            """
-            
-            result = self.db.execute_query(query)
-            
-            return {
-                "date": date,
-                "exchange": exchange,
-                "metric": metric,
-                "symbol_count": len(result),
-                "symbols": result.to_dict('records'),
-                "note": f"Most active symbols by {metric}"
-            }
-            
+            return await self._get_active_symbols(date, exchange, metric, limit, "DESC")
         except Exception as e:
             logger.error(f"Error getting most active symbols: {e}")
             raise
@@ -636,75 +744,7 @@ class ForestratMCPServer:
     ) -> Dict[str, Any]:
         """Get the least active symbols for a specific date"""
         try:
-            # Find the appropriate table for the exchange
-            table_mapping = {
-                'LSE': 'bronze.lse_market_data',
-                'CME': 'bronze.cme_market_data',
-                'NYQ': 'bronze.nyq_market_data'
-            }
-            
-            table_name = table_mapping.get(exchange.upper())
-            if not table_name:
-                return {
-                    "date": date,
-                    "exchange": exchange,
-                    "error": f"No table found for exchange {exchange}",
-                    "available_exchanges": list(table_mapping.keys())
-                }
-            
-            # Check if table exists
-            if not self.db.table_exists(table_name):
-                return {
-                    "date": date,
-                    "exchange": exchange,
-                    "error": f"Table {table_name} does not exist",
-                    "symbols": []
-                }
-            
-            # Check column types to handle data type differences
-            columns = self.db.get_table_columns(table_name)
-            
-            # Build query based on metric type
-            if metric == "volume":
-                # Use volume if available and numeric
-                if columns.get('Volume') in ['BIGINT', 'INTEGER', 'DOUBLE']:
-                    order_by = "total_volume ASC"
-                    select_metric = "SUM(Volume) as total_volume"
-                else:
-                    # Fallback to trade count if volume is not numeric
-                    order_by = "trade_count ASC"
-                    select_metric = "COUNT(*) as trade_count"
-                    metric = "trade_count"  # Update metric name for response
-            else:
-                order_by = "trade_count ASC"
-                select_metric = "COUNT(*) as trade_count"
-            
-            query = f"""
-            SELECT 
-                "#RIC" as symbol,
-                {select_metric},
-                AVG(Price) as avg_price,
-                MIN(Price) as min_price,
-                MAX(Price) as max_price,
-                COUNT(*) as trade_count
-            FROM {table_name}
-            WHERE data_date = '{date}'
-            GROUP BY "#RIC"
-            ORDER BY {order_by}
-            LIMIT {limit}
-            """
-            
-            result = self.db.execute_query(query)
-            
-            return {
-                "date": date,
-                "exchange": exchange,
-                "metric": metric,
-                "symbol_count": len(result),
-                "symbols": result.to_dict('records'),
-                "note": f"Least active symbols by {metric}"
-            }
-            
+            return await self._get_active_symbols(date, exchange, metric, limit, "ASC")
         except Exception as e:
             logger.error(f"Error getting least active symbols: {e}")
             raise
@@ -715,19 +755,7 @@ class ForestratMCPServer:
         if '.' in dataset:
             return dataset
         
-        # Map common dataset names to tables
-        mapping = {
-            'lse': 'bronze.lse_market_data',
-            'cme': 'bronze.cme_market_data',
-            'nyq': 'bronze.nyq_market_data',
-            'unified': 'silver.market_data_unified',
-            'market_data': 'silver.market_data_unified',
-            'timeseries': 'silver.price_timeseries',
-            'daily_summary': 'gold.daily_market_summary',
-            'arbitrage': 'gold.arbitrage_opportunities'
-        }
-        
-        return mapping.get(dataset.lower(), dataset)
+        return DATASET_TABLES.get(dataset.lower(), dataset)
     
     def _get_schema_description(self, schema: str) -> str:
         """Get description for schema"""
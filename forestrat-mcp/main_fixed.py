@@ -17,65 +17,1187 @@ Features:
 """
 
 import asyncio
+import atexit
+import copy
+import functools
+import inspect
 import json
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+import threading
+import time
 import uuid
-from typing import Any, Dict, List, Optional, AsyncGenerator
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, NamedTuple, Optional, AsyncGenerator, Set, Tuple, Union
 from datetime import datetime
+from types import MappingProxyType
+
+import fastjsonschema
+import orjson
+
+try:
+    import diskcache
+except ImportError:  # Holiday lookups are then only remembered for the life of the process
+    diskcache = None
 
 from database import DuckDBConnection
 from config import Config
+from stdio_transport import STDIN_LINE_LIMIT, is_notification, is_pollable, read_line
 
 config = Config()
 TABLE_MAPPINGS = config.DATASET_MAPPING
 
+# Resolved once at import instead of on every server instantiation
+DEFAULT_DATABASE_PATH = os.getenv("DATABASE_PATH", "../multi_exchange_data_lake.duckdb")
+LOG_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'forestrat_mcp_server.log')
+LOG_FILE_MAX_BYTES = 10_000_000
+LOG_FILE_BACKUP_COUNT = 3
+
+# Pending stdout bytes are written at the next loop tick, or immediately past this size
+STDOUT_FLUSH_THRESHOLD = 64 * 1024
+
+# Maximum number of requests handled concurrently
+MCP_MAX_INFLIGHT = int(os.getenv("MCP_MAX_INFLIGHT", "8"))
+
+# list_datasets without stats is a static catalog; with stats it is refreshed after this many seconds
+LIST_DATASETS_STATS_TTL = 30.0
+
+# Metadata tools whose results are reused for identical arguments (no date windows)
+CACHEABLE_TOOLS = frozenset({"get_table_schema", "get_dataset_exchanges"})
+# Metadata lookups that return too quickly for progress notifications to be useful
+FAST_TOOLS = frozenset({"get_table_schema", "get_available_symbols", "get_dataset_exchanges"})
+TOOL_RESULT_CACHE_TTL = 300.0
+TOOL_RESULT_CACHE_SIZE = 256
+
+# resources/read payloads are reused for this long; the report/overview resources summarize live data
+RESOURCE_CACHE_TTL = 300.0
+LIVE_RESOURCE_CACHE_TTL = 30.0
+RESOURCE_CACHE_SIZE = 64
+LIVE_RESOURCE_URIS = frozenset({"forestrat://reports/data_quality", "forestrat://stats/database_overview"})
+
+# The holiday tools scrape the web and ask an LLM; answers per (exchange, date) are kept
+# this long, and per (exchange, year range) for a day
+HOLIDAY_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.holiday_cache')
+HOLIDAY_CACHE_TTL = 30 * 86400
+HOLIDAY_YEAR_CACHE_TTL = 86400
+HOLIDAY_CACHE_SIZE = 256  # In-memory entries in front of the disk cache
+
+
+class NDJSONFormatter(logging.Formatter):
+    """Format log records as one JSON object per line"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "t": record.created,
+            "lvl": record.levelname,
+            "name": record.name,
+            "msg": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for an in-process listener; records keep their exception info"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() folds the traceback into msg and clears exc_info, which would
+        # leave NDJSONFormatter without an exc field. Only the args are merged here.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 # Configure logging
-import os
-log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'forestrat_mcp_server.log')
-log_handlers = [
-    logging.StreamHandler(sys.stderr),  # Log to stderr to avoid interfering with stdout JSON-RPC
-    logging.FileHandler(log_file_path, mode='a')  # Also log to file in current directory
-]
+# Callers only enqueue records; formatting and writing happen on the listener thread
+stderr_handler = logging.StreamHandler(sys.stderr)  # Log to stderr to avoid interfering with stdout JSON-RPC
+stderr_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+# Also log to file in current directory; opened on the first record and rotated by size
+file_handler = logging.handlers.RotatingFileHandler(
+    LOG_FILE_PATH, mode='a', maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT, delay=True
+)
+file_handler.setFormatter(NDJSONFormatter())
+
+log_queue = queue.SimpleQueue()
+queue_handler = LocalQueueHandler(log_queue)  # Layout is applied by the listener's handlers
+log_listener = logging.handlers.QueueListener(log_queue, stderr_handler, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=log_handlers
+    handlers=[queue_handler]
 )
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=1024)
+def _encode_int_id(request_id: int) -> bytes:
+    """Encode an integer request id (cached, ids repeat across sessions)"""
+    return str(request_id).encode()
+
+
+def encode_request_id(request_id: Optional[Any]) -> bytes:
+    """Encode a JSON-RPC request id as JSON bytes"""
+    if request_id is None:
+        return b'null'
+    if type(request_id) is int:
+        return _encode_int_id(request_id)
+    return orjson.dumps(request_id)
+
+
+# Fixed fragments of the JSON-RPC envelope, joined around the id and result in one pass
+ENVELOPE_PREFIX = b'{"jsonrpc":"2.0","id":'
+ENVELOPE_RESULT = b',"result":'
+ENVELOPE_SUFFIX = b'}'
+
+
+# Tool results may carry numpy scalars or non-string keys; datetimes keep their str() form
+RESULT_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dumps_result_text(result: Any) -> str:
+    """Render a tool result as compact JSON text"""
+    try:
+        return orjson.dumps(result, default=str, option=RESULT_JSON_OPTIONS).decode()
+    except orjson.JSONEncodeError:
+        # orjson rejects e.g. integers wider than 64 bits; keep its raw UTF-8 output style
+        return json.dumps(result, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def dumps_resource_text(content: Any) -> str:
+    """Render a resource payload as indented JSON text"""
+    try:
+        return orjson.dumps(content, option=orjson.OPT_INDENT_2 | RESULT_JSON_OPTIONS).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(content, indent=2, ensure_ascii=False)
+
+
+INITIALIZE_RESULT_BYTES = orjson.dumps({
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {},
+        "prompts": {},
+        "resources": {},
+        "experimental": {
+            "progressNotifications": {}
+        }
+    },
+    "serverInfo": {
+        "name": "forestrat-mcp",
+        "version": "1.0.0"
+    }
+})
+
+
+class ToolSpec(NamedTuple):
+    """Dispatch entry for a tools/call handler"""
+    method: str  # ForestratTools coroutine method name
+    required: Tuple[str, ...] = ()
+    optional: Tuple[Tuple[str, Any], ...] = ()
+    start_progress: Optional[Tuple[str, int]] = None
+    end_progress: Optional[Tuple[str, int]] = None
+    pass_arguments: bool = False  # Hand the raw arguments dict to the method
+
+
+_SESSION_DEFAULTS = (("session_start", "08:00:00"), ("session_end", "17:00:00"))
+
+# tools/call name -> ForestratTools method and argument layout
+TOOL_DISPATCH: Dict[str, ToolSpec] = {
+    "list_datasets": ToolSpec(
+        "list_datasets", (), (("include_stats", False),),
+        start_progress=("Gathering dataset information", 20)),
+    "get_dataset_exchanges": ToolSpec(
+        "get_dataset_exchanges", ("dataset",),
+        start_progress=("Querying dataset exchanges", 30)),
+    "get_data_for_time_range": ToolSpec(
+        "get_data_for_time_range", ("dataset", "start_date", "end_date"),
+        (("exchange", None), ("limit", 1000)),
+        start_progress=("Executing time range query", 25),
+        end_progress=("Processing query results", 75)),
+    "query_data": ToolSpec(
+        "query_data", ("query",), (("limit", 1000),),
+        start_progress=("Executing SQL query", 30),
+        end_progress=("Formatting query results", 80)),
+    "get_table_schema": ToolSpec("get_table_schema", ("table_name",)),
+    "get_available_symbols": ToolSpec(
+        "get_available_symbols", ("exchange",),
+        (("start_date", None), ("end_date", None))),
+    "get_most_active_symbols": ToolSpec(
+        "get_most_active_symbols", ("date", "exchange"),
+        (("metric", "trade_count"), ("limit", 10))),
+    "get_least_active_symbols": ToolSpec(
+        "get_least_active_symbols", ("date", "exchange"),
+        (("metric", "trade_count"), ("limit", 10))),
+    "get_symbols_by_category": ToolSpec(
+        "get_symbols_by_category", ("category",),
+        (("exchange", None), ("include_stats", False), ("date", None))),
+    "get_category_volume_data": ToolSpec(
+        "get_category_volume_data", ("category", "date", "exchange"),
+        (("metric", "both"),)),
+    "export_category_data": ToolSpec(
+        "export_category_data", ("category", "exchange"),
+        (("start_date", None), ("end_date", None), ("output_filename", None), ("format", None)),
+        start_progress=("Preparing data export", 10),
+        end_progress=("Export completed successfully", 90)),
+    "get_next_futures_symbols": ToolSpec(
+        "get_next_futures_symbols",
+        ("product_type", "start_month_name", "start_year", "num_futures"),
+        start_progress=("Calculating next futures symbols", 40)),
+    "get_unique_futures_count": ToolSpec(
+        "get_unique_futures_count", (),
+        (("exchange", None), ("start_date", None), ("end_date", None), ("include_details", False)),
+        start_progress=("Analyzing futures contracts", 35)),
+    "get_btc_eth_futures_volume_correlation": ToolSpec(
+        "get_btc_eth_futures_volume_correlation", ("start_date", "end_date"),
+        (("exchange", "CME"),),
+        start_progress=("Analyzing BTC-ETH correlation", 20),
+        end_progress=("Correlation analysis complete", 85)),
+    "generate_minute_bars_csv": ToolSpec(
+        "generate_minute_bars_csv", ("symbols", "start_date", "end_date"),
+        (("exchange", "CME"), ("output_filename", None)) + _SESSION_DEFAULTS,
+        start_progress=("Initializing minute bars generation", 5),
+        end_progress=("Minute bars CSV generation complete", 95)),
+    "generate_minute_bars_data": ToolSpec(
+        "generate_minute_bars_data", ("symbols", "start_date", "end_date"),
+        (("exchange", "CME"),) + _SESSION_DEFAULTS,
+        start_progress=("Processing minute bars data", 15),
+        end_progress=("Minute bars data processing complete", 90)),
+    "generate_minute_bars_python_function": ToolSpec(
+        "generate_minute_bars_python_function", ("symbols", "start_date", "end_date"),
+        (("exchange", "CME"),) + _SESSION_DEFAULTS,
+        start_progress=("Generating Python function code", 25),
+        end_progress=("Python function generation complete", 85)),
+    "analyze_minute_bars": ToolSpec(
+        "execute_minute_bars_analysis", pass_arguments=True,
+        start_progress=("Starting minute bars analysis", 10),
+        end_progress=("Minute bars analysis complete", 90)),
+    "check_exchange_holidays": ToolSpec(
+        "check_exchange_holidays", ("exchange", "date"),
+        (("api_key", None), ("groq_api_key", None)),
+        start_progress=("Checking exchange holiday information", 20),
+        end_progress=("Holiday check complete", 80)),
+    "get_exchange_holidays_for_year": ToolSpec(
+        "get_exchange_holidays_for_year", ("exchange", "year"),
+        (("end_year", None), ("api_key", None), ("groq_api_key", None)),
+        start_progress=("Retrieving annual holiday data", 15),
+        end_progress=("Annual holiday data retrieved", 85)),
+}
+
+
+class PromptSpec(NamedTuple):
+    """Dispatch entry for a prompts/get handler"""
+    method: str  # ForestratTools coroutine method name
+    description: str  # str.format template over the prompt arguments; absent ones render as None
+    required: Tuple[str, ...] = ()
+    optional: Tuple[Tuple[str, Any], ...] = ()
+    pass_arguments: bool = True  # Hand the raw arguments dict to the method
+
+
+class _PromptArguments(dict):
+    """Prompt arguments for description templates, mirroring arguments.get()"""
+    def __missing__(self, key):
+        return None
+
+
+PROMPT_DISPATCH: Dict[str, PromptSpec] = {
+    "daily_market_summary": PromptSpec(
+        "execute_daily_market_summary",
+        "Daily market summary for {exchange} on {date}"),
+    "cross_exchange_symbol_analysis": PromptSpec(
+        "execute_cross_exchange_analysis",
+        "Cross-exchange analysis for {symbol} on {date}"),
+    "detect_trading_anomalies": PromptSpec(
+        "execute_anomaly_detection",
+        "Trading anomaly detection for {exchange} on {date}"),
+    "volume_trend_analysis": PromptSpec(
+        "execute_volume_trend_analysis",
+        "Volume trend analysis for {exchange} from {start_date} to {end_date}"),
+    "get_quarterly_futures_analysis": PromptSpec(
+        "execute_quarterly_futures_analysis",
+        "Quarterly futures analysis for {product_type} starting from {start_month_name} {start_year}"),
+    "complete_quarterly_futures_analysis": PromptSpec(
+        "execute_complete_quarterly_futures_analysis",
+        "Complete sequential quarterly futures analysis for {product_type} starting from {start_month_name} {start_year}"),
+    "get_btc_eth_futures_volume_correlation": PromptSpec(
+        "get_btc_eth_futures_volume_correlation",
+        "BTC-ETH Futures Volume Correlation for {start_date} to {end_date} on {exchange}",
+        ("start_date", "end_date"), (("exchange", "CME"),), pass_arguments=False),
+    "analyze_minute_bars": PromptSpec(
+        "execute_minute_bars_analysis",
+        "Minute bars analysis for {symbols} from {start_date} to {end_date}"),
+}
+
+
+def _calendar_exchange(name: str) -> str:
+    """Map a calendar resource name such as 'lse_trading_days' to its exchange code"""
+    return name.replace("_trading_days", "").upper()
+
+
+# resources/read URIs without parameters -> ForestratTools reader method
+RESOURCE_READERS: Dict[str, str] = {
+    "forestrat://reports/data_quality": "read_data_quality_resource",
+    "forestrat://stats/database_overview": "read_database_overview_resource",
+    "forestrat://categories/symbol_categories": "read_symbol_categories_resource",
+}
+
+# Parameterized resource URIs, keyed by everything before the last "/":
+# prefix -> (ForestratTools reader method, converter for the final path segment)
+RESOURCE_FAMILY_READERS: Dict[str, Tuple[str, Optional[Callable[[str], str]]]] = {
+    "forestrat://schemas": ("read_schema_resource", None),
+    "forestrat://calendars": ("read_calendar_resource", _calendar_exchange),
+    "forestrat://mappings/symbols": ("read_symbol_mapping_resource", None),
+}
+
+
+def _resolve_resource_reader(uri: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """Map a resources/read URI to its ForestratTools reader method and arguments"""
+    method = RESOURCE_READERS.get(uri)
+    if method is not None:
+        return method, ()
+    prefix, _, name = uri.rpartition("/")
+    family = RESOURCE_FAMILY_READERS.get(prefix)
+    if family is None:
+        return None
+    method, convert = family
+    return method, (convert(name) if convert else name,)
+
+
+# Tool definitions advertised by tools/list; the serialized listing is built once at import
+# Property fragments shared by several tool input schemas
+_CATEGORY_ENUM = ["bitcoin_futures", "ethereum_futures", "crypto_futures", "micro_bitcoin", "standard_bitcoin", "micro_ethereum", "standard_ethereum"]
+_START_DATE_PROP = {
+    "type": "string",
+    "format": "date",
+    "description": "Start date (YYYY-MM-DD)"
+}
+_END_DATE_PROP = {
+    "type": "string",
+    "format": "date",
+    "description": "End date (YYYY-MM-DD)"
+}
+_ANALYSIS_DATE_PROP = {
+    "type": "string",
+    "format": "date",
+    "description": "Date to analyze (YYYY-MM-DD)"
+}
+_EXCHANGE_PROP = {
+    "type": "string",
+    "description": "Exchange name (LSE, CME, NYQ)"
+}
+_EXCHANGE_FILTER_PROP = {
+    "type": "string",
+    "description": "Exchange filter (LSE, CME, NYQ)"
+}
+_DEFAULT_CME_EXCHANGE_PROP = {
+    "type": "string",
+    "description": "Exchange name (default: CME)"
+}
+_ACTIVITY_METRIC_PROP = {
+    "type": "string",
+    "enum": ["volume", "trade_count"],
+    "description": "Metric to use for activity (volume or trade_count)"
+}
+_SYMBOLS_PROP = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "List of RIC symbols to process (e.g., ['BTCH25', 'BTCM25'])"
+}
+_SESSION_START_PROP = {
+    "type": "string",
+    "description": "Trading session start time (HH:MM:SS, default: 08:00:00)"
+}
+_SESSION_END_PROP = {
+    "type": "string",
+    "description": "Trading session end time (HH:MM:SS, default: 17:00:00)"
+}
+_HOLIDAY_EXCHANGE_PROP = {
+    "type": "string",
+    "enum": ["CME", "LSE", "NYQ"],
+    "description": "Exchange name (CME, LSE, or NYQ)"
+}
+_FIRECRAWL_API_KEY_PROP = {
+    "type": "string",
+    "description": "Firecrawl API key (optional, uses environment variable if not provided)"
+}
+_GROQ_API_KEY_PROP = {
+    "type": "string",
+    "description": "Groq API key for LLM analysis (optional, uses environment variable if not provided)"
+}
+
+TOOLS_LIST: List[Dict[str, Any]] = [
+    {
+        "name": "list_datasets",
+        "description": "List all datasets with vendor information and exchanges",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "include_stats": {
+                    "type": "boolean",
+                    "description": "Include record counts and date ranges"
+                }
+            },
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_dataset_exchanges",
+        "description": "Get all exchanges available for a specific dataset",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "dataset": {
+                    "type": "string",
+                    "description": "Dataset name (e.g., 'market_data', 'bronze', 'silver', 'gold')"
+                }
+            },
+            "required": ["dataset"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_data_for_time_range",
+        "description": "Get data for a specific dataset and time range",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "dataset": {
+                    "type": "string",
+                    "description": "Dataset name or table name"
+                },
+                "start_date": _START_DATE_PROP,
+                "end_date": _END_DATE_PROP,
+                "exchange": _EXCHANGE_FILTER_PROP,
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of records to return"
+                }
+            },
+            "required": ["dataset", "start_date", "end_date"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "query_data",
+        "description": "Execute SQL-like queries on the data",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "SQL query to execute"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of records to return"
+                }
+            },
+            "required": ["query"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_table_schema",
+        "description": "Get the schema/structure of a specific table",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Table name (e.g., 'bronze.lse_market_data')"
+                }
+            },
+            "required": ["table_name"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_available_symbols",
+        "description": "Get available symbols/instruments for a given exchange and date range",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "exchange": _EXCHANGE_PROP,
+                "start_date": _START_DATE_PROP,
+                "end_date": _END_DATE_PROP
+            },
+            "required": ["exchange"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_most_active_symbols",
+        "description": "Get the most active symbols for a specific date based on volume or trade count",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "date": _ANALYSIS_DATE_PROP,
+                "exchange": _EXCHANGE_PROP,
+                "metric": _ACTIVITY_METRIC_PROP,
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of top symbols to return (default: 10)"
+                }
+            },
+            "required": ["date", "exchange"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_least_active_symbols",
+        "description": "Get the least active symbols for a specific date based on volume or trade count",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "date": _ANALYSIS_DATE_PROP,
+                "exchange": _EXCHANGE_PROP,
+                "metric": _ACTIVITY_METRIC_PROP,
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of bottom symbols to return (default: 10)"
+                }
+            },
+            "required": ["date", "exchange"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_symbols_by_category",
+        "description": "Get predefined symbol lists by category (e.g., bitcoin_futures, ethereum_futures) for efficient queries without expensive LIKE operations",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "category": {
+                    "type": "string",
+                    "enum": _CATEGORY_ENUM,
+                    "description": "Symbol category to retrieve"
+                },
+                "exchange": {
+                    "type": "string",
+                    "description": "Exchange to filter by (optional)"
+                },
+                "include_stats": {
+                    "type": "boolean",
+                    "description": "Include trading statistics for the symbols (default: false)"
+                },
+                "date": {
+                    "type": "string",
+                    "format": "date",
+                    "description": "Date for statistics (required if include_stats is true)"
+                }
+            },
+            "required": ["category"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_category_volume_data",
+        "description": "Get volume and trading data for a specific symbol category (optimized for queries like 'bitcoin futures volume')",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "category": {
+                    "type": "string",
+                    "enum": _CATEGORY_ENUM,
+                    "description": "Symbol category to analyze"
+                },
+                "date": _ANALYSIS_DATE_PROP,
+                "exchange": _EXCHANGE_PROP,
+                "metric": {
+                    "type": "string",
+                    "enum": ["volume", "trade_count", "both"],
+                    "description": "Metric to retrieve (default: both)"
+                }
+            },
+            "required": ["category", "date", "exchange"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "export_category_data",
+        "description": "Export all data for a specific futures category to a CSV file",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "category": {
+                    "type": "string",
+                    "enum": _CATEGORY_ENUM,
+                    "description": "Symbol category to export"
+                },
+                "exchange": _EXCHANGE_PROP,
+                "start_date": {
+                    "type": "string",
+                    "format": "date",
+                    "description": "Start date for data export (YYYY-MM-DD, optional)"
+                },
+                "end_date": {
+                    "type": "string",
+                    "format": "date",
+                    "description": "End date for data export (YYYY-MM-DD, optional)"
+                },
+                "output_filename": {
+                    "type": "string",
+                    "description": "Output filename (optional, will auto-generate if not provided)"
+                },
+                "format": {
+                    "type": "string",
+                    "enum": ["csv", "json"],
+                    "description": "Export format (default: csv)"
+                }
+            },
+            "required": ["category", "exchange"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_next_futures_symbols",
+        "description": "Generate the next N futures symbols for a product type (bitcoin -> BTC, micro bitcoin -> MBT, others return 'work in progress')",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "product_type": {
+                    "type": "string",
+                    "description": "Type of product: 'bitcoin', 'micro bitcoin', 'standard bitcoin', 'btc', 'mbt', or any other (returns work in progress)"
+                },
+                "start_month_name": {
+                    "type": "string",
+                    "enum": ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"],
+                    "description": "Starting month name (full month name with first letter capitalized)"
+                },
+                "start_year": {
+                    "type": "integer",
+                    "description": "Starting year (e.g., 2025)",
+                    "minimum": 2020,
+                    "maximum": 2030
+                },
+                "num_futures": {
+                    "type": "integer",
+                    "description": "Number of consecutive futures contracts to generate",
+                    "minimum": 1,
+                    "maximum": 24
+                }
+            },
+            "required": ["product_type", "start_month_name", "start_year", "num_futures"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_unique_futures_count",
+        "description": "Get the number of unique futures instruments, optionally filtered by exchange and date range, with detailed symbol information",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "exchange": _EXCHANGE_FILTER_PROP,
+                "start_date": {
+                    "type": "string",
+                    "format": "date",
+                    "description": "Start date filter (YYYY-MM-DD)"
+                },
+                "end_date": {
+                    "type": "string",
+                    "format": "date",
+                    "description": "End date filter (YYYY-MM-DD)"
+                },
+                "include_details": {
+                    "type": "boolean",
+                    "description": "Include detailed symbol information with trading statistics"
+                }
+            },
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_btc_eth_futures_volume_correlation",
+        "description": "Compute the correlation between bitcoin and ether futures daily volume for a date range (CME only)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "start_date": _START_DATE_PROP,
+                "end_date": _END_DATE_PROP,
+                "exchange": {
+                    "type": "string",
+                    "description": "Exchange to use (default: CME)"
+                }
+            },
+            "required": ["start_date", "end_date"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "generate_minute_bars_csv",
+        "description": "Generate minute bars for specified symbols and export to CSV file",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "symbols": _SYMBOLS_PROP,
+                "start_date": _START_DATE_PROP,
+                "end_date": _END_DATE_PROP,
+                "exchange": _DEFAULT_CME_EXCHANGE_PROP,
+                "output_filename": {
+                    "type": "string",
+                    "description": "Output filename (optional, auto-generated if not provided)"
+                },
+                "session_start": _SESSION_START_PROP,
+                "session_end": _SESSION_END_PROP
+            },
+            "required": ["symbols", "start_date", "end_date"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "generate_minute_bars_data",
+        "description": "Generate minute bars data for Jupyter notebook analysis",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "symbols": _SYMBOLS_PROP,
+                "start_date": _START_DATE_PROP,
+                "end_date": _END_DATE_PROP,
+                "exchange": _DEFAULT_CME_EXCHANGE_PROP,
+                "session_start": _SESSION_START_PROP,
+                "session_end": _SESSION_END_PROP
+            },
+            "required": ["symbols", "start_date", "end_date"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "generate_minute_bars_python_function",
+        "description": "Generate a complete Python function for minute bars analysis that users can modify and run",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "symbols": _SYMBOLS_PROP,
+                "start_date": _START_DATE_PROP,
+                "end_date": _END_DATE_PROP,
+                "exchange": _DEFAULT_CME_EXCHANGE_PROP,
+                "session_start": _SESSION_START_PROP,
+                "session_end": _SESSION_END_PROP
+            },
+            "required": ["symbols", "start_date", "end_date"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "check_exchange_holidays",
+        "description": "Check if a specific date is a holiday for a given exchange using web scraping and LLM analysis (CME, LSE, NYQ)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "exchange": _HOLIDAY_EXCHANGE_PROP,
+                "date": {
+                    "type": "string",
+                    "format": "date",
+                    "description": "Date to check in YYYY-MM-DD format"
+                },
+                "api_key": _FIRECRAWL_API_KEY_PROP,
+                "groq_api_key": _GROQ_API_KEY_PROP
+            },
+            "required": ["exchange", "date"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "get_exchange_holidays_for_year",
+        "description": "Get all holidays for an exchange for a specific year or range of years using AI-powered analysis",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "exchange": _HOLIDAY_EXCHANGE_PROP,
+                "year": {
+                    "type": "integer",
+                    "minimum": 2020,
+                    "maximum": 2030,
+                    "description": "Starting year for holiday analysis (e.g., 2025)"
+                },
+                "end_year": {
+                    "type": "integer",
+                    "minimum": 2020,
+                    "maximum": 2030,
+                    "description": "Optional ending year for multi-year analysis (e.g., 2026)"
+                },
+                "api_key": _FIRECRAWL_API_KEY_PROP,
+                "groq_api_key": _GROQ_API_KEY_PROP
+            },
+            "required": ["exchange", "year"],
+            "additionalProperties": False
+        }
+    }
+]
+
+TOOLS_LIST_RESULT_BYTES = orjson.dumps({"tools": TOOLS_LIST})
+# tools/call argument validators, generated from the advertised inputSchemas at import
+TOOL_VALIDATORS: Dict[str, Callable[[Any], Any]] = {
+    tool["name"]: fastjsonschema.compile(tool["inputSchema"]) for tool in TOOLS_LIST
+}
+
+PROMPTS_LIST: List[Dict[str, Any]] = [
+    {
+        "name": "daily_market_summary",
+        "description": "Generate a comprehensive daily market summary with activity, volume leaders, and key statistics",
+        "arguments": [
+            {
+                "name": "date",
+                "description": "Trading date to analyze (YYYY-MM-DD)",
+                "required": True
+            },
+            {
+                "name": "exchange", 
+                "description": "Exchange to analyze (LSE, CME, or NYQ)",
+                "required": True
+            },
+            {
+                "name": "top_n",
+                "description": "Number of top/bottom symbols to include (default: 10)",
+                "required": False
+            }
+        ]
+    },
+    {
+        "name": "cross_exchange_symbol_analysis",
+        "description": "Compare a symbol's trading activity and performance across multiple exchanges",
+        "arguments": [
+            {
+                "name": "symbol",
+                "description": "Symbol to analyze (RIC format)",
+                "required": True
+            },
+            {
+                "name": "date",
+                "description": "Analysis date (YYYY-MM-DD)",
+                "required": True
+            },
+            {
+                "name": "exchanges",
+                "description": "Comma-separated list of exchanges to compare (default: LSE,CME,NYQ)",
+                "required": False
+            }
+        ]
+    },
+    {
+        "name": "detect_trading_anomalies",
+        "description": "Identify unusual trading patterns and outliers for a specific date",
+        "arguments": [
+            {
+                "name": "date",
+                "description": "Date to analyze for anomalies (YYYY-MM-DD)",
+                "required": True
+            },
+            {
+                "name": "exchange",
+                "description": "Exchange to analyze (LSE, CME, or NYQ)",
+                "required": True
+            },
+            {
+                "name": "threshold",
+                "description": "Anomaly threshold in standard deviations (default: 3)",
+                "required": False
+            }
+        ]
+    },
+    {
+        "name": "volume_trend_analysis",
+        "description": "Analyze volume trends and patterns over a date range",
+        "arguments": [
+            {
+                "name": "start_date",
+                "description": "Start date for trend analysis (YYYY-MM-DD)",
+                "required": True
+            },
+            {
+                "name": "end_date",
+                "description": "End date for trend analysis (YYYY-MM-DD)",
+                "required": True
+            },
+            {
+                "name": "exchange",
+                "description": "Exchange to analyze (LSE, CME, or NYQ)",
+                "required": True
+            },
+            {
+                "name": "symbols",
+                "description": "Comma-separated list of specific symbols to analyze (optional)",
+                "required": False
+            }
+        ]
+    },
+    {
+        "name": "get_quarterly_futures_analysis",
+        "description": "Generate futures contracts starting from a specific month and filter to show only quarterly futures (March H, June M, September U, December Z)",
+        "arguments": [
+            {
+                "name": "product_type",
+                "description": "Type of product: 'bitcoin', 'micro bitcoin', 'standard bitcoin', 'btc', 'mbt'",
+                "required": True
+            },
+            {
+                "name": "start_month_name",
+                "description": "Starting month name (January, February, March, etc.)",
+                "required": True
+            },
+            {
+                "name": "start_year",
+                "description": "Starting year (e.g., 2025)",
+                "required": True
+            },
+            {
+                "name": "num_quarterly_futures",
+                "description": "Number of quarterly futures contracts to find (default: 2)",
+                "required": False
+            }
+        ]
+    },
+    {
+        "name": "complete_quarterly_futures_analysis",
+        "description": "Complete 3-step sequential analysis: 1) Generate front futures from start month, 2) Filter to quarterly contracts, 3) Compute trades and quotes for those instruments during continuous sessions",
+        "arguments": [
+            {
+                "name": "product_type",
+                "description": "Type of product: 'bitcoin', 'micro bitcoin', 'standard bitcoin', 'btc', 'mbt'",
+                "required": True
+            },
+            {
+                "name": "start_month_name",
+                "description": "Starting month name (January, February, March, etc.)",
+                "required": True
+            },
+            {
+                "name": "start_year",
+                "description": "Starting year (e.g., 2025)",
+                "required": True
+            },
+            {
+                "name": "num_front_months",
+                "description": "Number of front months to generate initially (default: 2)",
+                "required": False
+            },
+            {
+                "name": "analysis_date",
+                "description": "Date for trading analysis (YYYY-MM-DD format, optional - uses latest available if not provided)",
+                "required": False
+            },
+            {
+                "name": "exchange",
+                "description": "Exchange for trading data (CME, LSE, NYQ - default: CME for crypto futures)",
+                "required": False
+            }
+        ]
+    },
+    {
+        "name": "analyze_minute_bars",
+        "description": "Generate minute bars analysis for specified symbols with comprehensive statistics and data export options",
+        "arguments": [
+            {
+                "name": "symbols",
+                "description": "Comma-separated list of RIC symbols to analyze (e.g., 'BTCH25,BTCM25,BTCU25')",
+                "required": True
+            },
+            {
+                "name": "start_date",
+                "description": "Start date for analysis (YYYY-MM-DD)",
+                "required": True
+            },
+            {
+                "name": "end_date",
+                "description": "End date for analysis (YYYY-MM-DD)",
+                "required": True
+            },
+            {
+                "name": "exchange",
+                "description": "Exchange to analyze (default: CME)",
+                "required": False
+            },
+            {
+                "name": "session_start",
+                "description": "Trading session start time (HH:MM:SS, default: 08:00:00)",
+                "required": False
+            },
+            {
+                "name": "session_end",
+                "description": "Trading session end time (HH:MM:SS, default: 17:00:00)",
+                "required": False
+            },
+            {
+                "name": "export_csv",
+                "description": "Whether to export results to CSV (default: false)",
+                "required": False
+            }
+        ]
+    }
+]
+
+PROMPTS_LIST_RESULT_BYTES = orjson.dumps({"prompts": PROMPTS_LIST})
+# prompts/get validators; the advertised argument lists only constrain presence, not types
+PROMPT_VALIDATORS: Dict[str, Callable[[Any], Any]] = {
+    prompt["name"]: fastjsonschema.compile({
+        "type": "object",
+        "properties": {argument["name"]: {} for argument in prompt.get("arguments", [])},
+        "required": [argument["name"] for argument in prompt.get("arguments", []) if argument.get("required")]
+    })
+    for prompt in PROMPTS_LIST
+}
+
+RESOURCES_LIST: List[Dict[str, Any]] = [
+    {
+        "uri": "forestrat://schemas/bronze",
+        "name": "Bronze Layer Schema",
+        "description": "Current schema and data types for bronze layer tables",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://schemas/silver", 
+        "name": "Silver Layer Schema",
+        "description": "Current schema and data types for silver layer tables",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://schemas/gold",
+        "name": "Gold Layer Schema", 
+        "description": "Current schema and data types for gold layer tables",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://calendars/lse_trading_days",
+        "name": "LSE Trading Calendar",
+        "description": "Available trading dates for LSE data",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://calendars/cme_trading_days",
+        "name": "CME Trading Calendar", 
+        "description": "Available trading dates for CME data",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://calendars/nyq_trading_days",
+        "name": "NYQ Trading Calendar",
+        "description": "Available trading dates for NYQ data", 
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://reports/data_quality",
+        "name": "Data Quality Report",
+        "description": "Overall data completeness and quality metrics",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://mappings/symbols/LSE",
+        "name": "LSE Symbol Directory",
+        "description": "Available symbols and their metadata for LSE",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://mappings/symbols/CME", 
+        "name": "CME Symbol Directory",
+        "description": "Available symbols and their metadata for CME",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://mappings/symbols/NYQ",
+        "name": "NYQ Symbol Directory", 
+        "description": "Available symbols and their metadata for NYQ",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://stats/database_overview",
+        "name": "Database Overview",
+        "description": "High-level statistics about the entire database",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "forestrat://categories/symbol_categories",
+        "name": "Symbol Categories",
+        "description": "Predefined symbol categories for efficient queries (e.g., bitcoin_futures, ethereum_futures)",
+        "mimeType": "application/json"
+    }
+]
+
+RESOURCES_LIST_RESULT_BYTES = orjson.dumps({"resources": RESOURCES_LIST})
+# Advertised URIs are resolved once so resources/read skips the URI parsing for them
+RESOURCE_URI_READERS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    resource["uri"]: _resolve_resource_reader(resource["uri"]) for resource in RESOURCES_LIST
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into read-only mappings and tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Clients are served the bytes encoded above (orjson cannot encode a mappingproxy), so
+# freeze the source listings to keep them from drifting out of sync with what is sent
+TOOLS_LIST = _freeze(TOOLS_LIST)
+PROMPTS_LIST = _freeze(PROMPTS_LIST)
+RESOURCES_LIST = _freeze(RESOURCES_LIST)
+
+
+# Stand-in for an omitted or null "params" member
+_NO_PARAMS: Mapping[str, Any] = MappingProxyType({})
+
+# Shared empty "data" payload for progress reports; never mutated
+_NO_PROGRESS_DATA: Dict[str, Any] = {}
+
+
 class StreamingProgress:
     """Class to handle streaming progress updates"""
     
     def __init__(self, server_instance, request_id: str, tool_name: str):
         self.server = server_instance
+        # Report notifications reuse one dict; _send_notification encodes it before yielding
+        self._report_value = {
+            "kind": "report",
+            "message": "",
+            "percentage": None,
+            "step": 0,
+            "tool": tool_name,
+            "data": _NO_PROGRESS_DATA
+        }
+        self._report_params = {
+            "progressToken": request_id,
+            "value": self._report_value
+        }
+        self._report = {
+            "jsonrpc": "2.0",
+            "method": "notifications/progress",
+            "params": self._report_params
+        }
+        self.reset(request_id, tool_name)
+    
+    def reset(self, request_id: str, tool_name: str):
+        """Rebind a pooled tracker to a new tool call"""
         self.request_id = request_id
         self.tool_name = tool_name
         self.step_count = 0
+        self._report_value["tool"] = tool_name
+        self._report_params["progressToken"] = request_id
         
     async def update(self, message: str, progress_percent: Optional[float] = None, data: Optional[Dict] = None):
         """Send a progress update notification"""
         self.step_count += 1
         
-        notification = {
-            "jsonrpc": "2.0",
-            "method": "notifications/progress",
-            "params": {
-                "progressToken": self.request_id,
-                "value": {
-                    "kind": "report",
-                    "message": message,
-                    "percentage": progress_percent,
-                    "step": self.step_count,
-                    "tool": self.tool_name,
-                    "data": data or {}
-                }
-            }
-        }
+        value = self._report_value
+        value["message"] = message
+        value["percentage"] = progress_percent
+        value["step"] = self.step_count
+        value["data"] = data or _NO_PROGRESS_DATA
         
-        await self.server._send_notification(notification)
+        await self.server._send_notification(self._report)
+    
+    async def chunk(self, batch_size: int, chunk_index: int, rows_read: int):
+        """Report one batch of result rows read; the rows themselves go in the final response"""
+        await self.update(
+            f"Read rows {rows_read - batch_size + 1}-{rows_read}",
+            None,
+            {"chunk_index": chunk_index, "row_count": batch_size}
+        )
         
     async def complete(self, message: str = "Operation completed"):
         """Send completion notification"""
@@ -100,22 +1222,62 @@ class ForestratMCPServer:
     """Forestrat MCP Server using manual JSON-RPC implementation with streaming support"""
     
     def __init__(self, database_path: Optional[str] = None):
-        import os
         if database_path is None:
-            database_path = os.getenv("DATABASE_PATH", "../multi_exchange_data_lake.duckdb")
+            database_path = DEFAULT_DATABASE_PATH
         
         self.db = DuckDBConnection(database_path)
         self.tools = ForestratTools(self.db)
+        # Bound once so tools/call skips the attribute lookup on every request
+        self._tool_handlers: Dict[str, Callable[..., Any]] = {
+            name: getattr(self.tools, spec.method)
+            for name, spec in TOOL_DISPATCH.items()
+            if hasattr(self.tools, spec.method)
+        }
+        # uri -> (bound reader, arguments) for every advertised resource
+        self._resource_handlers: Dict[str, Tuple[Callable[..., Any], Tuple[str, ...]]] = {
+            uri: (getattr(self.tools, method), args)
+            for uri, (method, args) in RESOURCE_URI_READERS.items()
+            if hasattr(self.tools, method)
+        }
         self.initialized = False
         self.streaming_enabled = True  # Enable streaming by default
+        # Idle StreamingProgress trackers, reused across tool calls
+        self._progress_pool: List[StreamingProgress] = []
+        # include_stats -> (stored_at, serialized tool result)
+        self._list_datasets_cache: Dict[bool, Tuple[float, bytes]] = {}
+        # (tool name, sorted-key argument JSON) -> (stored_at, serialized tool result)
+        self._tool_result_cache: Dict[Tuple[str, bytes], Tuple[float, bytes]] = {}
+        # uri -> (stored_at, serialized resources/read result)
+        self._resource_cache: Dict[str, Tuple[float, bytes]] = {}
+        # uri -> resources/read lookup currently in progress
+        self._resource_inflight: Dict[str, asyncio.Future] = {}
+        # "EXCHANGE:YYYY-MM-DD" or "EXCHANGE:YEAR:END_YEAR" -> (expires_at wall-clock time,
+        # serialized holiday tool result), least recently used first, in front of the disk cache
+        self._holiday_cache: Dict[str, Tuple[float, bytes]] = {}
+        self._holiday_disk_cache = None  # Opened on first use; False once it is known to be unavailable
+        self._holiday_disk_lock = threading.Lock()  # Disk cache calls run on executor threads
+        self._stdout_writer: Optional[asyncio.StreamWriter] = None
+        self._stdout_fd = sys.stdout.fileno()
+        # Messages queued during one loop iteration go out in a single write
+        self._out_buf = bytearray()
+        self._flush_scheduled = False
+        self.method_dispatch = {
+            "initialize": self.handle_initialize,
+            "tools/list": self.handle_list_tools,
+            "tools/call": self.handle_call_tool,
+            "prompts/list": self.handle_list_prompts,
+            "prompts/get": self.handle_get_prompt,
+            "resources/list": self.handle_list_resources,
+            "resources/read": self.handle_read_resource,
+        }
         logger.info("Forestrat MCP Server with Streaming initialized")
     
     async def _send_notification(self, notification: Dict[str, Any]):
         """Send a notification (no response expected)"""
         try:
-            notification_json = json.dumps(notification, ensure_ascii=True, separators=(',', ':'))
-            print(notification_json, flush=True)
-            logger.info(f"📡 Sent progress notification: {notification['params']['value']['message']}")
+            # Notifications only join the outgoing buffer; the scheduled flush does the syscall
+            self._queue_message(orjson.dumps(notification, default=str, option=RESULT_JSON_OPTIONS))
+            logger.debug("📡 Sent progress notification: %s", notification['params']['value'].get('message'))
         except Exception as e:
             logger.error(f"❌ Error sending notification: {e}")
     
@@ -138,1322 +1300,591 @@ class ForestratMCPServer:
             }
         }
     
-    def handle_initialize(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _envelope_ok(self, request_id: Optional[Any], result_bytes: bytes) -> bytes:
+        """Assemble a serialized JSON-RPC response around an already-encoded result"""
+        # A single join copies large precomputed listings once instead of once per '+'
+        return b''.join((ENVELOPE_PREFIX, encode_request_id(request_id), ENVELOPE_RESULT, result_bytes, ENVELOPE_SUFFIX))
+    
+    def _envelope_err(self, request_id: Optional[Any], code: int, message: str) -> bytes:
+        """Assemble a serialized JSON-RPC error response"""
+        return (ENVELOPE_PREFIX + encode_request_id(request_id) +
+                b',"error":{"code":' + b'%d' % code + b',"message":' + orjson.dumps(message) + b'}}')
+    
+    def _get_cached_list_datasets(self, include_stats: bool) -> Optional[bytes]:
+        """Return the memoized list_datasets result, if still fresh"""
+        entry = self._list_datasets_cache.get(include_stats)
+        if entry is None:
+            return None
+        stored_at, payload = entry
+        if include_stats and time.monotonic() - stored_at > LIST_DATASETS_STATS_TTL:
+            del self._list_datasets_cache[include_stats]
+            return None
+        return payload
+    
+    def _get_cached_tool_result(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        """Return a memoized CACHEABLE_TOOLS result, if still fresh"""
+        entry = self._tool_result_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, payload = entry
+        if time.monotonic() - stored_at > TOOL_RESULT_CACHE_TTL:
+            del self._tool_result_cache[key]
+            return None
+        return payload
+    
+    def _store_tool_result(self, key: Tuple[str, bytes], payload: bytes):
+        """Memoize a tool result, evicting the oldest entry beyond TOOL_RESULT_CACHE_SIZE"""
+        cache = self._tool_result_cache
+        cache.pop(key, None)
+        cache[key] = (time.monotonic(), payload)
+        if len(cache) > TOOL_RESULT_CACHE_SIZE:
+            del cache[next(iter(cache))]
+    
+    def _get_cached_resource(self, uri: str) -> Optional[bytes]:
+        """Return a serialized resources/read result, if still fresh"""
+        entry = self._resource_cache.get(uri)
+        if entry is None:
+            return None
+        stored_at, payload = entry
+        ttl = LIVE_RESOURCE_CACHE_TTL if uri in LIVE_RESOURCE_URIS else RESOURCE_CACHE_TTL
+        if time.monotonic() - stored_at > ttl:
+            del self._resource_cache[uri]
+            return None
+        return payload
+    
+    def _store_resource(self, uri: str, payload: bytes):
+        """Memoize a resources/read result, evicting the oldest entry beyond RESOURCE_CACHE_SIZE"""
+        cache = self._resource_cache
+        cache.pop(uri, None)
+        cache[uri] = (time.monotonic(), payload)
+        if len(cache) > RESOURCE_CACHE_SIZE:
+            del cache[next(iter(cache))]
+    
+    def _get_holiday_disk_cache(self):
+        """The on-disk holiday cache, or None when diskcache is missing or the directory is unusable"""
+        with self._holiday_disk_lock:
+            if self._holiday_disk_cache is None:
+                self._holiday_disk_cache = False
+                if diskcache is not None:
+                    try:
+                        self._holiday_disk_cache = diskcache.Cache(HOLIDAY_CACHE_DIR)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Holiday cache unavailable at {HOLIDAY_CACHE_DIR}: {e}")
+        # Compared explicitly: an empty diskcache.Cache is falsy
+        return None if self._holiday_disk_cache is False else self._holiday_disk_cache
+    
+    def _load_holiday(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """Read (expires_at, payload) for a holiday result from disk; blocking"""
+        disk_cache = self._get_holiday_disk_cache()
+        if disk_cache is None:
+            return None
+        try:
+            payload, expires_at = disk_cache.get(key, expire_time=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read holiday result for {key}: {e}")
+            return None
+        if payload is None:
+            return None
+        return (expires_at if expires_at is not None else time.time() + HOLIDAY_CACHE_TTL), payload
+    
+    def _persist_holiday(self, key: str, payload: bytes, ttl: float):
+        """Write a holiday result to disk for ttl seconds; blocking"""
+        disk_cache = self._get_holiday_disk_cache()
+        if disk_cache is not None:
+            try:
+                disk_cache.set(key, payload, expire=ttl)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not persist holiday result for {key}: {e}")
+    
+    def _remember_holiday(self, key: str, expires_at: float, payload: bytes):
+        """Keep a holiday result in memory, evicting the least recently used beyond HOLIDAY_CACHE_SIZE"""
+        cache = self._holiday_cache
+        cache.pop(key, None)
+        cache[key] = (expires_at, payload)
+        if len(cache) > HOLIDAY_CACHE_SIZE:
+            del cache[next(iter(cache))]
+    
+    async def _get_cached_holiday(self, key: str) -> Optional[bytes]:
+        """Return a remembered holiday tool result from memory or disk"""
+        cache = self._holiday_cache
+        entry = cache.pop(key, None)
+        if entry is not None and entry[0] < time.time():
+            entry = None
+        if entry is None:
+            # The SQLite-backed store stays off the event loop
+            entry = await asyncio.get_running_loop().run_in_executor(None, self._load_holiday, key)
+            if entry is None:
+                return None
+        # Re-inserted to mark it most recently used; disk hits keep their disk expiry
+        self._remember_holiday(key, *entry)
+        return entry[1]
+    
+    async def _store_holiday(self, key: str, payload: bytes, ttl: float = HOLIDAY_CACHE_TTL):
+        """Remember a holiday tool result in memory and on disk for ttl seconds"""
+        self._remember_holiday(key, time.time() + ttl, payload)
+        await asyncio.get_running_loop().run_in_executor(None, self._persist_holiday, key, payload, ttl)
+    
+    async def _write_message(self, payload: bytes):
+        """Write one newline-framed JSON-RPC message to stdout and wait for the writer"""
+        self._queue_message(payload)
+        if self._stdout_writer is not None:
+            # Flushed now, together with any queued notifications, so drain() applies
+            # backpressure to this message rather than to the previous tick's
+            self._flush_stdout()
+            await self._stdout_writer.drain()
+    
+    def _queue_message(self, payload: bytes):
+        """Append one newline-framed JSON-RPC message to the stdout buffer"""
+        # Appending whole messages keeps framing intact across concurrent requests
+        self._out_buf += payload
+        self._out_buf += b'\n'
+        if len(self._out_buf) >= STDOUT_FLUSH_THRESHOLD:
+            self._flush_stdout()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush_stdout)
+    
+    def _flush_stdout(self):
+        """Write all queued messages to stdout at once"""
+        self._flush_scheduled = False
+        if not self._out_buf:
+            return
+        data = bytes(self._out_buf)
+        self._out_buf.clear()
+        
+        if self._stdout_writer is not None:
+            self._stdout_writer.write(data)
+        else:
+            # Unbuffered write straight to the fd: one syscall for the common case
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._stdout_fd, view):]
+    
+    def handle_initialize(self, request_id: Any, params: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
         """Handle initialize request"""
         logger.info("Handling initialize request")
         self.initialized = True
         
         # Check if client supports progress notifications
         client_capabilities = params.get("capabilities", {})
-        progress_notifications = client_capabilities.get("experimental", {}).get("progressNotifications")
-        self.streaming_enabled = isinstance(progress_notifications, dict) or progress_notifications is not None
+        # Any declared value (typically a dict) opts the client in
+        self.streaming_enabled = client_capabilities.get("experimental", {}).get("progressNotifications") is not None
         
         logger.info(f"Streaming enabled: {self.streaming_enabled}")
         
-        return self.create_response(request_id, {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {
-                "tools": {},
-                "prompts": {},
-                "resources": {},
-                "experimental": {
-                    "progressNotifications": {}
-                }
-            },
-            "serverInfo": {
-                "name": "forestrat-mcp",
-                "version": "1.0.0"
-            }
-        })
+        return self._envelope_ok(request_id, INITIALIZE_RESULT_BYTES)
     
-    def handle_list_tools(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_list_tools(self, request_id: Any, params: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
         """Handle tools/list request"""
-        logger.info("Handling tools/list request")
+        logger.debug("Handling tools/list request")
         
         if not self.initialized:
             return self.create_error(request_id, -32002, "Server not initialized")
         
-        tools = [
-            {
-                "name": "list_datasets",
-                "description": "List all datasets with vendor information and exchanges",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "include_stats": {
-                            "type": "boolean",
-                            "description": "Include record counts and date ranges"
-                        }
-                    },
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_dataset_exchanges",
-                "description": "Get all exchanges available for a specific dataset",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "dataset": {
-                            "type": "string",
-                            "description": "Dataset name (e.g., 'market_data', 'bronze', 'silver', 'gold')"
-                        }
-                    },
-                    "required": ["dataset"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_data_for_time_range",
-                "description": "Get data for a specific dataset and time range",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "dataset": {
-                            "type": "string",
-                            "description": "Dataset name or table name"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Start date (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "End date (YYYY-MM-DD)"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange filter (LSE, CME, NYQ)"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "description": "Maximum number of records to return"
-                        }
-                    },
-                    "required": ["dataset", "start_date", "end_date"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "query_data",
-                "description": "Execute SQL-like queries on the data",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "SQL query to execute"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "description": "Maximum number of records to return"
-                        }
-                    },
-                    "required": ["query"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_table_schema",
-                "description": "Get the schema/structure of a specific table",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "table_name": {
-                            "type": "string",
-                            "description": "Table name (e.g., 'bronze.lse_market_data')"
-                        }
-                    },
-                    "required": ["table_name"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_available_symbols",
-                "description": "Get available symbols/instruments for a given exchange and date range",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange name (LSE, CME, NYQ)"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Start date (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "End date (YYYY-MM-DD)"
-                        }
-                    },
-                    "required": ["exchange"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_most_active_symbols",
-                "description": "Get the most active symbols for a specific date based on volume or trade count",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Date to analyze (YYYY-MM-DD)"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange name (LSE, CME, NYQ)"
-                        },
-                        "metric": {
-                            "type": "string",
-                            "enum": ["volume", "trade_count"],
-                            "description": "Metric to use for activity (volume or trade_count)"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "description": "Number of top symbols to return (default: 10)"
-                        }
-                    },
-                    "required": ["date", "exchange"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_least_active_symbols",
-                "description": "Get the least active symbols for a specific date based on volume or trade count",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Date to analyze (YYYY-MM-DD)"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange name (LSE, CME, NYQ)"
-                        },
-                        "metric": {
-                            "type": "string",
-                            "enum": ["volume", "trade_count"],
-                            "description": "Metric to use for activity (volume or trade_count)"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "description": "Number of bottom symbols to return (default: 10)"
-                        }
-                    },
-                    "required": ["date", "exchange"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_symbols_by_category",
-                "description": "Get predefined symbol lists by category (e.g., bitcoin_futures, ethereum_futures) for efficient queries without expensive LIKE operations",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "category": {
-                            "type": "string",
-                            "enum": ["bitcoin_futures", "ethereum_futures", "crypto_futures", "micro_bitcoin", "standard_bitcoin", "micro_ethereum", "standard_ethereum"],
-                            "description": "Symbol category to retrieve"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange to filter by (optional)"
-                        },
-                        "include_stats": {
-                            "type": "boolean",
-                            "description": "Include trading statistics for the symbols (default: false)"
-                        },
-                        "date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Date for statistics (required if include_stats is true)"
-                        }
-                    },
-                    "required": ["category"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_category_volume_data",
-                "description": "Get volume and trading data for a specific symbol category (optimized for queries like 'bitcoin futures volume')",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "category": {
-                            "type": "string",
-                            "enum": ["bitcoin_futures", "ethereum_futures", "crypto_futures", "micro_bitcoin", "standard_bitcoin", "micro_ethereum", "standard_ethereum"],
-                            "description": "Symbol category to analyze"
-                        },
-                        "date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Date to analyze (YYYY-MM-DD)"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange name (LSE, CME, NYQ)"
-                        },
-                        "metric": {
-                            "type": "string",
-                            "enum": ["volume", "trade_count", "both"],
-                            "description": "Metric to retrieve (default: both)"
-                        }
-                    },
-                    "required": ["category", "date", "exchange"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "export_category_data",
-                "description": "Export all data for a specific futures category to a CSV file",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "category": {
-                            "type": "string",
-                            "enum": ["bitcoin_futures", "ethereum_futures", "crypto_futures", "micro_bitcoin", "standard_bitcoin", "micro_ethereum", "standard_ethereum"],
-                            "description": "Symbol category to export"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange name (LSE, CME, NYQ)"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Start date for data export (YYYY-MM-DD, optional)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "End date for data export (YYYY-MM-DD, optional)"
-                        },
-                        "output_filename": {
-                            "type": "string",
-                            "description": "Output filename (optional, will auto-generate if not provided)"
-                        },
-                        "format": {
-                            "type": "string",
-                            "enum": ["csv", "json"],
-                            "description": "Export format (default: csv)"
-                        }
-                    },
-                    "required": ["category", "exchange"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_next_futures_symbols",
-                "description": "Generate the next N futures symbols for a product type (bitcoin -> BTC, micro bitcoin -> MBT, others return 'work in progress')",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "product_type": {
-                            "type": "string",
-                            "description": "Type of product: 'bitcoin', 'micro bitcoin', 'standard bitcoin', 'btc', 'mbt', or any other (returns work in progress)"
-                        },
-                        "start_month_name": {
-                            "type": "string",
-                            "enum": ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"],
-                            "description": "Starting month name (full month name with first letter capitalized)"
-                        },
-                        "start_year": {
-                            "type": "integer",
-                            "description": "Starting year (e.g., 2025)",
-                            "minimum": 2020,
-                            "maximum": 2030
-                        },
-                        "num_futures": {
-                            "type": "integer",
-                            "description": "Number of consecutive futures contracts to generate",
-                            "minimum": 1,
-                            "maximum": 24
-                        }
-                    },
-                    "required": ["product_type", "start_month_name", "start_year", "num_futures"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_unique_futures_count",
-                "description": "Get the number of unique futures instruments, optionally filtered by exchange and date range, with detailed symbol information",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange filter (LSE, CME, NYQ)"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Start date filter (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "End date filter (YYYY-MM-DD)"
-                        },
-                        "include_details": {
-                            "type": "boolean",
-                            "description": "Include detailed symbol information with trading statistics"
-                        }
-                    },
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_btc_eth_futures_volume_correlation",
-                "description": "Compute the correlation between bitcoin and ether futures daily volume for a date range (CME only)",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "start_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Start date (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "End date (YYYY-MM-DD)"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange to use (default: CME)"
-                        }
-                    },
-                    "required": ["start_date", "end_date"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "generate_minute_bars_csv",
-                "description": "Generate minute bars for specified symbols and export to CSV file",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "symbols": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of RIC symbols to process (e.g., ['BTCH25', 'BTCM25'])"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Start date (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "End date (YYYY-MM-DD)"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange name (default: CME)"
-                        },
-                        "output_filename": {
-                            "type": "string",
-                            "description": "Output filename (optional, auto-generated if not provided)"
-                        },
-                        "session_start": {
-                            "type": "string",
-                            "description": "Trading session start time (HH:MM:SS, default: 08:00:00)"
-                        },
-                        "session_end": {
-                            "type": "string",
-                            "description": "Trading session end time (HH:MM:SS, default: 17:00:00)"
-                        }
-                    },
-                    "required": ["symbols", "start_date", "end_date"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "generate_minute_bars_data",
-                "description": "Generate minute bars data for Jupyter notebook analysis",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "symbols": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of RIC symbols to process (e.g., ['BTCH25', 'BTCM25'])"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Start date (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "End date (YYYY-MM-DD)"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange name (default: CME)"
-                        },
-                        "session_start": {
-                            "type": "string",
-                            "description": "Trading session start time (HH:MM:SS, default: 08:00:00)"
-                        },
-                        "session_end": {
-                            "type": "string",
-                            "description": "Trading session end time (HH:MM:SS, default: 17:00:00)"
-                        }
-                    },
-                    "required": ["symbols", "start_date", "end_date"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "generate_minute_bars_python_function",
-                "description": "Generate a complete Python function for minute bars analysis that users can modify and run",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "symbols": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of RIC symbols to process (e.g., ['BTCH25', 'BTCM25'])"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Start date (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "End date (YYYY-MM-DD)"
-                        },
-                        "exchange": {
-                            "type": "string",
-                            "description": "Exchange name (default: CME)"
-                        },
-                        "session_start": {
-                            "type": "string",
-                            "description": "Trading session start time (HH:MM:SS, default: 08:00:00)"
-                        },
-                        "session_end": {
-                            "type": "string",
-                            "description": "Trading session end time (HH:MM:SS, default: 17:00:00)"
-                        }
-                    },
-                    "required": ["symbols", "start_date", "end_date"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "check_exchange_holidays",
-                "description": "Check if a specific date is a holiday for a given exchange using web scraping and LLM analysis (CME, LSE, NYQ)",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "exchange": {
-                            "type": "string",
-                            "enum": ["CME", "LSE", "NYQ"],
-                            "description": "Exchange name (CME, LSE, or NYQ)"
-                        },
-                        "date": {
-                            "type": "string",
-                            "format": "date",
-                            "description": "Date to check in YYYY-MM-DD format"
-                        },
-                        "api_key": {
-                            "type": "string",
-                            "description": "Firecrawl API key (optional, uses environment variable if not provided)"
-                        },
-                        "groq_api_key": {
-                            "type": "string",
-                            "description": "Groq API key for LLM analysis (optional, uses environment variable if not provided)"
-                        }
-                    },
-                    "required": ["exchange", "date"],
-                    "additionalProperties": False
-                }
-            },
-            {
-                "name": "get_exchange_holidays_for_year",
-                "description": "Get all holidays for an exchange for a specific year or range of years using AI-powered analysis",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "exchange": {
-                            "type": "string",
-                            "enum": ["CME", "LSE", "NYQ"],
-                            "description": "Exchange name (CME, LSE, or NYQ)"
-                        },
-                        "year": {
-                            "type": "integer",
-                            "minimum": 2020,
-                            "maximum": 2030,
-                            "description": "Starting year for holiday analysis (e.g., 2025)"
-                        },
-                        "end_year": {
-                            "type": "integer",
-                            "minimum": 2020,
-                            "maximum": 2030,
-                            "description": "Optional ending year for multi-year analysis (e.g., 2026)"
-                        },
-                        "api_key": {
-                            "type": "string",
-                            "description": "Firecrawl API key (optional, uses environment variable if not provided)"
-                        },
-                        "groq_api_key": {
-                            "type": "string",
-                            "description": "Groq API key for LLM analysis (optional, uses environment variable if not provided)"
-                        }
-                    },
-                    "required": ["exchange", "year"],
-                    "additionalProperties": False
-                }
-            }
-        ]
-        
-        return self.create_response(request_id, {
-            "tools": tools
-        })
+        return self._envelope_ok(request_id, TOOLS_LIST_RESULT_BYTES)
     
-    def handle_list_prompts(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_list_prompts(self, request_id: Any, params: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
         """Handle prompts/list request"""
-        logger.info("Handling prompts/list request")
+        logger.debug("Handling prompts/list request")
         
         if not self.initialized:
             return self.create_error(request_id, -32002, "Server not initialized")
         
-        prompts = [
-            {
-                "name": "daily_market_summary",
-                "description": "Generate a comprehensive daily market summary with activity, volume leaders, and key statistics",
-                "arguments": [
-                    {
-                        "name": "date",
-                        "description": "Trading date to analyze (YYYY-MM-DD)",
-                        "required": True
-                    },
-                    {
-                        "name": "exchange", 
-                        "description": "Exchange to analyze (LSE, CME, or NYQ)",
-                        "required": True
-                    },
-                    {
-                        "name": "top_n",
-                        "description": "Number of top/bottom symbols to include (default: 10)",
-                        "required": False
-                    }
-                ]
-            },
-            {
-                "name": "cross_exchange_symbol_analysis",
-                "description": "Compare a symbol's trading activity and performance across multiple exchanges",
-                "arguments": [
-                    {
-                        "name": "symbol",
-                        "description": "Symbol to analyze (RIC format)",
-                        "required": True
-                    },
-                    {
-                        "name": "date",
-                        "description": "Analysis date (YYYY-MM-DD)",
-                        "required": True
-                    },
-                    {
-                        "name": "exchanges",
-                        "description": "Comma-separated list of exchanges to compare (default: LSE,CME,NYQ)",
-                        "required": False
-                    }
-                ]
-            },
-            {
-                "name": "detect_trading_anomalies",
-                "description": "Identify unusual trading patterns and outliers for a specific date",
-                "arguments": [
-                    {
-                        "name": "date",
-                        "description": "Date to analyze for anomalies (YYYY-MM-DD)",
-                        "required": True
-                    },
-                    {
-                        "name": "exchange",
-                        "description": "Exchange to analyze (LSE, CME, or NYQ)",
-                        "required": True
-                    },
-                    {
-                        "name": "threshold",
-                        "description": "Anomaly threshold in standard deviations (default: 3)",
-                        "required": False
-                    }
-                ]
-            },
-            {
-                "name": "volume_trend_analysis",
-                "description": "Analyze volume trends and patterns over a date range",
-                "arguments": [
-                    {
-                        "name": "start_date",
-                        "description": "Start date for trend analysis (YYYY-MM-DD)",
-                        "required": True
-                    },
-                    {
-                        "name": "end_date",
-                        "description": "End date for trend analysis (YYYY-MM-DD)",
-                        "required": True
-                    },
-                    {
-                        "name": "exchange",
-                        "description": "Exchange to analyze (LSE, CME, or NYQ)",
-                        "required": True
-                    },
-                    {
-                        "name": "symbols",
-                        "description": "Comma-separated list of specific symbols to analyze (optional)",
-                        "required": False
-                    }
-                ]
-            },
-            {
-                "name": "get_quarterly_futures_analysis",
-                "description": "Generate futures contracts starting from a specific month and filter to show only quarterly futures (March H, June M, September U, December Z)",
-                "arguments": [
-                    {
-                        "name": "product_type",
-                        "description": "Type of product: 'bitcoin', 'micro bitcoin', 'standard bitcoin', 'btc', 'mbt'",
-                        "required": True
-                    },
-                    {
-                        "name": "start_month_name",
-                        "description": "Starting month name (January, February, March, etc.)",
-                        "required": True
-                    },
-                    {
-                        "name": "start_year",
-                        "description": "Starting year (e.g., 2025)",
-                        "required": True
-                    },
-                    {
-                        "name": "num_quarterly_futures",
-                        "description": "Number of quarterly futures contracts to find (default: 2)",
-                        "required": False
-                    }
-                ]
-            },
-            {
-                "name": "complete_quarterly_futures_analysis",
-                "description": "Complete 3-step sequential analysis: 1) Generate front futures from start month, 2) Filter to quarterly contracts, 3) Compute trades and quotes for those instruments during continuous sessions",
-                "arguments": [
-                    {
-                        "name": "product_type",
-                        "description": "Type of product: 'bitcoin', 'micro bitcoin', 'standard bitcoin', 'btc', 'mbt'",
-                        "required": True
-                    },
-                    {
-                        "name": "start_month_name",
-                        "description": "Starting month name (January, February, March, etc.)",
-                        "required": True
-                    },
-                    {
-                        "name": "start_year",
-                        "description": "Starting year (e.g., 2025)",
-                        "required": True
-                    },
-                    {
-                        "name": "num_front_months",
-                        "description": "Number of front months to generate initially (default: 2)",
-                        "required": False
-                    },
-                    {
-                        "name": "analysis_date",
-                        "description": "Date for trading analysis (YYYY-MM-DD format, optional - uses latest available if not provided)",
-                        "required": False
-                    },
-                    {
-                        "name": "exchange",
-                        "description": "Exchange for trading data (CME, LSE, NYQ - default: CME for crypto futures)",
-                        "required": False
-                    }
-                ]
-            },
-            {
-                "name": "analyze_minute_bars",
-                "description": "Generate minute bars analysis for specified symbols with comprehensive statistics and data export options",
-                "arguments": [
-                    {
-                        "name": "symbols",
-                        "description": "Comma-separated list of RIC symbols to analyze (e.g., 'BTCH25,BTCM25,BTCU25')",
-                        "required": True
-                    },
-                    {
-                        "name": "start_date",
-                        "description": "Start date for analysis (YYYY-MM-DD)",
-                        "required": True
-                    },
-                    {
-                        "name": "end_date",
-                        "description": "End date for analysis (YYYY-MM-DD)",
-                        "required": True
-                    },
-                    {
-                        "name": "exchange",
-                        "description": "Exchange to analyze (default: CME)",
-                        "required": False
-                    },
-                    {
-                        "name": "session_start",
-                        "description": "Trading session start time (HH:MM:SS, default: 08:00:00)",
-                        "required": False
-                    },
-                    {
-                        "name": "session_end",
-                        "description": "Trading session end time (HH:MM:SS, default: 17:00:00)",
-                        "required": False
-                    },
-                    {
-                        "name": "export_csv",
-                        "description": "Whether to export results to CSV (default: false)",
-                        "required": False
-                    }
-                ]
-            }
-        ]
-        
-        return self.create_response(request_id, {
-            "prompts": prompts
-        })
+        return self._envelope_ok(request_id, PROMPTS_LIST_RESULT_BYTES)
     
-    def handle_list_resources(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_list_resources(self, request_id: Any, params: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
         """Handle resources/list request"""
-        logger.info("Handling resources/list request")
+        logger.debug("Handling resources/list request")
         
         if not self.initialized:
             return self.create_error(request_id, -32002, "Server not initialized")
         
-        resources = [
-            {
-                "uri": "forestrat://schemas/bronze",
-                "name": "Bronze Layer Schema",
-                "description": "Current schema and data types for bronze layer tables",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://schemas/silver", 
-                "name": "Silver Layer Schema",
-                "description": "Current schema and data types for silver layer tables",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://schemas/gold",
-                "name": "Gold Layer Schema", 
-                "description": "Current schema and data types for gold layer tables",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://calendars/lse_trading_days",
-                "name": "LSE Trading Calendar",
-                "description": "Available trading dates for LSE data",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://calendars/cme_trading_days",
-                "name": "CME Trading Calendar", 
-                "description": "Available trading dates for CME data",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://calendars/nyq_trading_days",
-                "name": "NYQ Trading Calendar",
-                "description": "Available trading dates for NYQ data", 
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://reports/data_quality",
-                "name": "Data Quality Report",
-                "description": "Overall data completeness and quality metrics",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://mappings/symbols/LSE",
-                "name": "LSE Symbol Directory",
-                "description": "Available symbols and their metadata for LSE",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://mappings/symbols/CME", 
-                "name": "CME Symbol Directory",
-                "description": "Available symbols and their metadata for CME",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://mappings/symbols/NYQ",
-                "name": "NYQ Symbol Directory", 
-                "description": "Available symbols and their metadata for NYQ",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://stats/database_overview",
-                "name": "Database Overview",
-                "description": "High-level statistics about the entire database",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "forestrat://categories/symbol_categories",
-                "name": "Symbol Categories",
-                "description": "Predefined symbol categories for efficient queries (e.g., bitcoin_futures, ethereum_futures)",
-                "mimeType": "application/json"
-            }
-        ]
-        
-        return self.create_response(request_id, {
-            "resources": resources
-        })
+        return self._envelope_ok(request_id, RESOURCES_LIST_RESULT_BYTES)
     
     async def handle_get_prompt(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle prompts/get request"""
         name = params.get("name")
         arguments = params.get("arguments", {})
         
-        logger.info(f"📝 Executing prompt: {name}")
-        logger.info(f"📝 Prompt arguments: {json.dumps(arguments, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📝 Executing prompt: %s", name)
+            logger.debug("📝 Prompt arguments: %s", orjson.dumps(arguments).decode())
         
         if not self.initialized:
             return self.create_error(request_id, -32002, "Server not initialized")
         
+        validator = PROMPT_VALIDATORS.get(name)
+        if validator is not None:
+            try:
+                validator(arguments)
+            except fastjsonschema.JsonSchemaValueException as e:
+                logger.warning("Invalid arguments for prompt %s: %s", name, e.message)
+                return self.create_error(request_id, -32602, f"Invalid params: {e.message}")
+        
         try:
-            if name == "daily_market_summary":
-                content = await self.tools.execute_daily_market_summary(arguments)
-                return self.create_response(request_id, {
-                    "description": f"Daily market summary for {arguments.get('exchange')} on {arguments.get('date')}",
-                    "content": [{"type": "text", "text": content}]
-                })
-            elif name == "cross_exchange_symbol_analysis":
-                content = await self.tools.execute_cross_exchange_analysis(arguments)
-                return self.create_response(request_id, {
-                    "description": f"Cross-exchange analysis for {arguments.get('symbol')} on {arguments.get('date')}",
-                    "content": [{"type": "text", "text": content}]
-                })
-            elif name == "detect_trading_anomalies":
-                content = await self.tools.execute_anomaly_detection(arguments)
-                return self.create_response(request_id, {
-                    "description": f"Trading anomaly detection for {arguments.get('exchange')} on {arguments.get('date')}",
-                    "content": [{"type": "text", "text": content}]
-                })
-            elif name == "volume_trend_analysis":
-                content = await self.tools.execute_volume_trend_analysis(arguments)
-                return self.create_response(request_id, {
-                    "description": f"Volume trend analysis for {arguments.get('exchange')} from {arguments.get('start_date')} to {arguments.get('end_date')}",
-                    "content": [{"type": "text", "text": content}]
-                })
-            elif name == "get_quarterly_futures_analysis":
-                content = await self.tools.execute_quarterly_futures_analysis(arguments)
-                return self.create_response(request_id, {
-                    "description": f"Quarterly futures analysis for {arguments.get('product_type')} starting from {arguments.get('start_month_name')} {arguments.get('start_year')}",
-                    "content": [{"type": "text", "text": content}]
-                })
-            elif name == "complete_quarterly_futures_analysis":
-                content = await self.tools.execute_complete_quarterly_futures_analysis(arguments)
-                return self.create_response(request_id, {
-                    "description": f"Complete sequential quarterly futures analysis for {arguments.get('product_type')} starting from {arguments.get('start_month_name')} {arguments.get('start_year')}",
-                    "content": [{"type": "text", "text": content}]
-                })
-            elif name == "get_btc_eth_futures_volume_correlation":
-                content = await self.tools.get_btc_eth_futures_volume_correlation(
-                    arguments["start_date"],
-                    arguments["end_date"],
-                    arguments.get("exchange", "CME")
-                )
-                return self.create_response(request_id, {
-                    "description": f"BTC-ETH Futures Volume Correlation for {arguments.get('start_date')} to {arguments.get('end_date')} on {arguments.get('exchange', 'CME')}",
-                    "content": [{"type": "text", "text": content}]
-                })
-            elif name == "analyze_minute_bars":
-                content = await self.tools.execute_minute_bars_analysis(arguments)
-                return self.create_response(request_id, {
-                    "description": f"Minute bars analysis for {arguments.get('symbols')} from {arguments.get('start_date')} to {arguments.get('end_date')}",
-                    "content": [{"type": "text", "text": content}]
-                })
-            else:
+            spec = PROMPT_DISPATCH.get(name)
+            if spec is None:
                 return self.create_error(request_id, -32602, f"Unknown prompt: {name}")
+            
+            handler = getattr(self.tools, spec.method)
+            if spec.pass_arguments:
+                content = await handler(arguments)
+            else:
+                args = [arguments[key] for key in spec.required]
+                args.extend(arguments.get(key, default) for key, default in spec.optional)
+                content = await handler(*args)
+            description = spec.description.format_map(_PromptArguments(spec.optional, **arguments))
+            return self.create_response(request_id, {
+                "description": description,
+                "content": [{"type": "text", "text": content}]
+            })
                 
         except Exception as e:
             logger.error(f"Error executing prompt {name}: {e}")
             return self.create_error(request_id, -32603, f"Internal error: {str(e)}")
     
-    async def handle_read_resource(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_read_resource(self, request_id: Any, params: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
         """Handle resources/read request"""
         uri = params.get("uri")
         
-        logger.info(f"📚 Reading resource: {uri}")
+        logger.debug("📚 Reading resource: %s", uri)
         
         if not self.initialized:
             return self.create_error(request_id, -32002, "Server not initialized")
         
+        cached = self._get_cached_resource(uri) if isinstance(uri, str) else None
+        if cached is not None:
+            return self._envelope_ok(request_id, cached)
+        
         try:
-            if uri.startswith("forestrat://schemas/"):
-                layer = uri.split("/")[-1]
-                content = await self.tools.read_schema_resource(layer)
-                return self.create_response(request_id, {
-                    "contents": [{"uri": uri, "mimeType": "application/json", "text": json.dumps(content, indent=2)}]
-                })
-            elif uri.startswith("forestrat://calendars/"):
-                exchange = uri.split("/")[-1].replace("_trading_days", "").upper()
-                content = await self.tools.read_calendar_resource(exchange)
-                return self.create_response(request_id, {
-                    "contents": [{"uri": uri, "mimeType": "application/json", "text": json.dumps(content, indent=2)}]
-                })
-            elif uri.startswith("forestrat://mappings/symbols/"):
-                exchange = uri.split("/")[-1]
-                content = await self.tools.read_symbol_mapping_resource(exchange)
-                return self.create_response(request_id, {
-                    "contents": [{"uri": uri, "mimeType": "application/json", "text": json.dumps(content, indent=2)}]
-                })
-            elif uri == "forestrat://reports/data_quality":
-                content = await self.tools.read_data_quality_resource()
-                return self.create_response(request_id, {
-                    "contents": [{"uri": uri, "mimeType": "application/json", "text": json.dumps(content, indent=2)}]
-                })
-            elif uri == "forestrat://stats/database_overview":
-                content = await self.tools.read_database_overview_resource()
-                return self.create_response(request_id, {
-                    "contents": [{"uri": uri, "mimeType": "application/json", "text": json.dumps(content, indent=2)}]
-                })
-            elif uri == "forestrat://categories/symbol_categories":
-                content = await self.tools.read_symbol_categories_resource()
-                return self.create_response(request_id, {
-                    "contents": [{"uri": uri, "mimeType": "application/json", "text": json.dumps(content, indent=2)}]
-                })
-            else:
+            # Concurrent reads of the same URI share one in-flight lookup
+            pending = self._resource_inflight.get(uri)
+            if pending is None:
+                pending = asyncio.ensure_future(self._read_resource_bytes(uri))
+                self._resource_inflight[uri] = pending
+                pending.add_done_callback(lambda _: self._resource_inflight.pop(uri, None))
+            # Shielded so one cancelled reader does not cancel the lookup for the others
+            result_bytes = await asyncio.shield(pending)
+            if result_bytes is None:
                 return self.create_error(request_id, -32602, f"Unknown resource URI: {uri}")
+            return self._envelope_ok(request_id, result_bytes)
                 
         except Exception as e:
             logger.error(f"Error reading resource {uri}: {e}")
             return self.create_error(request_id, -32603, f"Internal error: {str(e)}")
     
-    async def handle_call_tool(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def _read_resource_bytes(self, uri: str) -> Optional[bytes]:
+        """Fetch and encode a resources/read result, or None for an unknown URI"""
+        entry = self._resource_handlers.get(uri)
+        if entry is None:
+            # Unadvertised names within a known URI family are still passed to the reader
+            resolved = _resolve_resource_reader(uri)
+            if resolved is None:
+                return None
+            method, args = resolved
+            entry = (getattr(self.tools, method), args)
+        reader, args = entry
+        content = await reader(*args)
+        
+        result_bytes = orjson.dumps({
+            "contents": [{"uri": uri, "mimeType": "application/json", "text": dumps_resource_text(content)}]
+        })
+        self._store_resource(uri, result_bytes)
+        return result_bytes
+    
+    async def handle_call_tool(self, request_id: Any, params: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
         """Handle tools/call request with streaming support"""
         name = params.get("name")
+        if isinstance(name, str):
+            # Interned so the TOOL_DISPATCH probe compares by identity
+            name = sys.intern(name)
         arguments = params.get("arguments", {})
         
-        logger.info(f"🔧 Executing tool: {name}")
-        logger.info(f"🔧 Tool arguments: {json.dumps(arguments, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔧 Executing tool: %s", name)
+            logger.debug("🔧 Tool arguments: %s", orjson.dumps(arguments).decode())
         
         if not self.initialized:
             logger.error("❌ Server not initialized for tool call")
             return self.create_error(request_id, -32002, "Server not initialized")
         
+        validator = TOOL_VALIDATORS.get(name)
+        if validator is not None:
+            try:
+                validator(arguments)
+            except fastjsonschema.JsonSchemaValueException as e:
+                logger.warning("Invalid arguments for tool %s: %s", name, e.message)
+                return self.create_error(request_id, -32602, f"Invalid params: {e.message}")
+        
+        # The dataset catalog is served from memory without touching ForestratTools
+        if name == "list_datasets":
+            cached = self._get_cached_list_datasets(bool(arguments.get("include_stats", False)))
+            if cached is not None:
+                return self._envelope_ok(request_id, cached)
+        
+        cache_key = None
+        if name in CACHEABLE_TOOLS:
+            cache_key = (name, orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS))
+            cached = self._get_cached_tool_result(cache_key)
+            if cached is not None:
+                return self._envelope_ok(request_id, cached)
+        
+        # Explicit API keys mean the caller wants a fresh lookup with their own credentials
+        holiday_key = None
+        holiday_ttl = HOLIDAY_CACHE_TTL
+        if "api_key" not in arguments and "groq_api_key" not in arguments:
+            if name == "check_exchange_holidays":
+                holiday_key = f"{arguments['exchange']}:{arguments['date']}"
+            elif name == "get_exchange_holidays_for_year":
+                holiday_key = f"{arguments['exchange']}:{arguments['year']}:{arguments.get('end_year')}"
+                holiday_ttl = HOLIDAY_YEAR_CACHE_TTL
+        if holiday_key is not None:
+            cached = await self._get_cached_holiday(holiday_key)
+            if cached is not None:
+                return self._envelope_ok(request_id, cached)
+        
         # Create streaming progress tracker if enabled
         progress = None
-        if self.streaming_enabled:
-            progress = StreamingProgress(self, str(request_id), name)
+        if self.streaming_enabled and name not in FAST_TOOLS:
+            if self._progress_pool:
+                progress = self._progress_pool.pop()
+                progress.reset(str(request_id), name)
+            else:
+                progress = StreamingProgress(self, str(request_id), name)
             await progress.update(f"Starting {name} execution", 0)
         
         try:
-            if name == "list_datasets":
-                if progress:
-                    await progress.update("Gathering dataset information", 20)
-                result = await self.tools.list_datasets(arguments.get("include_stats", False))
-            elif name == "get_dataset_exchanges":
-                if progress:
-                    await progress.update("Querying dataset exchanges", 30)
-                result = await self.tools.get_dataset_exchanges(arguments["dataset"])
-            elif name == "get_data_for_time_range":
-                if progress:
-                    await progress.update("Executing time range query", 25)
-                result = await self.tools.get_data_for_time_range(
-                    arguments["dataset"],
-                    arguments["start_date"],
-                    arguments["end_date"],
-                    arguments.get("exchange"),
-                    arguments.get("limit", 1000)
-                )
-                if progress:
-                    await progress.update("Processing query results", 75)
-            elif name == "query_data":
-                if progress:
-                    await progress.update("Executing SQL query", 30)
-                result = await self.tools.query_data(
-                    arguments["query"],
-                    arguments.get("limit", 1000)
-                )
-                if progress:
-                    await progress.update("Formatting query results", 80)
-            elif name == "get_table_schema":
-                result = await self.tools.get_table_schema(arguments["table_name"])
-            elif name == "get_available_symbols":
-                result = await self.tools.get_available_symbols(
-                    arguments["exchange"],
-                    arguments.get("start_date"),
-                    arguments.get("end_date")
-                )
-            elif name == "get_most_active_symbols":
-                result = await self.tools.get_most_active_symbols(
-                    arguments["date"],
-                    arguments["exchange"],
-                    arguments.get("metric", "trade_count"),
-                    arguments.get("limit", 10)
-                )
-            elif name == "get_least_active_symbols":
-                result = await self.tools.get_least_active_symbols(
-                    arguments["date"],
-                    arguments["exchange"],
-                    arguments.get("metric", "trade_count"),
-                    arguments.get("limit", 10)
-                )
-            elif name == "get_symbols_by_category":
-                result = await self.tools.get_symbols_by_category(
-                    arguments["category"],
-                    arguments.get("exchange"),
-                    arguments.get("include_stats", False),
-                    arguments.get("date")
-                )
-            elif name == "get_category_volume_data":
-                result = await self.tools.get_category_volume_data(
-                    arguments["category"],
-                    arguments["date"],
-                    arguments["exchange"],
-                    arguments.get("metric", "both")
-                )
-            elif name == "export_category_data":
-                if progress:
-                    await progress.update("Preparing data export", 10)
-                result = await self.tools.export_category_data(
-                    arguments["category"],
-                    arguments["exchange"],
-                    arguments.get("start_date"),
-                    arguments.get("end_date"),
-                    arguments.get("output_filename"),
-                    arguments.get("format")
-                )
-                if progress:
-                    await progress.update("Export completed successfully", 90)
-            elif name == "get_next_futures_symbols":
-                if progress:
-                    await progress.update("Calculating next futures symbols", 40)
-                result = await self.tools.get_next_futures_symbols(
-                    arguments["product_type"],
-                    arguments["start_month_name"],
-                    arguments["start_year"],
-                    arguments["num_futures"]
-                )
-            elif name == "get_unique_futures_count":
-                if progress:
-                    await progress.update("Analyzing futures contracts", 35)
-                result = await self.tools.get_unique_futures_count(
-                    arguments.get("exchange"),
-                    arguments.get("start_date"),
-                    arguments.get("end_date"),
-                    arguments.get("include_details", False)
-                )
-            elif name == "get_btc_eth_futures_volume_correlation":
-                if progress:
-                    await progress.update("Analyzing BTC-ETH correlation", 20)
-                result = await self.tools.get_btc_eth_futures_volume_correlation(
-                    arguments["start_date"],
-                    arguments["end_date"],
-                    arguments.get("exchange", "CME")
-                )
-                if progress:
-                    await progress.update("Correlation analysis complete", 85)
-            elif name == "generate_minute_bars_csv":
-                if progress:
-                    await progress.update("Initializing minute bars generation", 5)
-                result = await self.tools.generate_minute_bars_csv(
-                    arguments["symbols"],
-                    arguments["start_date"],
-                    arguments["end_date"],
-                    arguments.get("exchange", "CME"),
-                    arguments.get("output_filename"),
-                    arguments.get("session_start", "08:00:00"),
-                    arguments.get("session_end", "17:00:00")
-                )
-                if progress:
-                    await progress.update("Minute bars CSV generation complete", 95)
-            elif name == "generate_minute_bars_data":
-                if progress:
-                    await progress.update("Processing minute bars data", 15)
-                result = await self.tools.generate_minute_bars_data(
-                    arguments["symbols"],
-                    arguments["start_date"],
-                    arguments["end_date"],
-                    arguments.get("exchange", "CME"),
-                    arguments.get("session_start", "08:00:00"),
-                    arguments.get("session_end", "17:00:00")
-                )
-                if progress:
-                    await progress.update("Minute bars data processing complete", 90)
-            elif name == "generate_minute_bars_python_function":
-                if progress:
-                    await progress.update("Generating Python function code", 25)
-                result = await self.tools.generate_minute_bars_python_function(
-                    arguments["symbols"],
-                    arguments["start_date"],
-                    arguments["end_date"],
-                    arguments.get("exchange", "CME"),
-                    arguments.get("session_start", "08:00:00"),
-                    arguments.get("session_end", "17:00:00")
-                )
-                if progress:
-                    await progress.update("Python function generation complete", 85)
-            elif name == "analyze_minute_bars":
-                if progress:
-                    await progress.update("Starting minute bars analysis", 10)
-                result = await self.tools.execute_minute_bars_analysis(arguments)
-                if progress:
-                    await progress.update("Minute bars analysis complete", 90)
-            elif name == "check_exchange_holidays":
-                if progress:
-                    await progress.update("Checking exchange holiday information", 20)
-                result = await self.tools.check_exchange_holidays(
-                    arguments["exchange"],
-                    arguments["date"],
-                    arguments.get("api_key"),
-                    arguments.get("groq_api_key")
-                )
-                if progress:
-                    await progress.update("Holiday check complete", 80)
-            elif name == "get_exchange_holidays_for_year":
-                if progress:
-                    await progress.update("Retrieving annual holiday data", 15)
-                result = await self.tools.get_exchange_holidays_for_year(
-                    arguments["exchange"],
-                    arguments["year"],
-                    arguments.get("end_year"),
-                    arguments.get("api_key"),
-                    arguments.get("groq_api_key")
-                )
-                if progress:
-                    await progress.update("Annual holiday data retrieved", 85)
-            else:
+            spec = TOOL_DISPATCH.get(name)
+            if spec is None:
                 logger.error(f"❌ Unknown tool requested: {name}")
                 return self.create_error(request_id, -32601, f"Unknown tool: {name}")
+            
+            if progress and spec.start_progress:
+                await progress.update(*spec.start_progress)
+            handler = self._tool_handlers.get(name)
+            if handler is None:
+                # Tools build without this method; surface it like any handler failure
+                handler = getattr(self.tools, spec.method)
+            if spec.pass_arguments:
+                result = handler(arguments)
+            else:
+                args = [arguments[key] for key in spec.required]
+                args.extend(arguments.get(key, default) for key, default in spec.optional)
+                result = handler(*args)
+            if inspect.isawaitable(result):
+                result = await result
+            if hasattr(result, "__aiter__"):
+                result = await self._drain_result_chunks(result, progress)
+            if progress and spec.end_progress:
+                await progress.update(*spec.end_progress)
                 
             # Send completion notification if streaming is enabled
             if progress:
                 await progress.complete(f"Tool {name} completed successfully")
                 
-            logger.info(f"✅ Tool {name} completed successfully")
-            logger.info(f"📊 Result summary: {len(str(result))} characters")
+            logger.info("✅ Tool %s completed successfully", name)
             
-            return self.create_response(request_id, {
+            # Serialize once and report the size of what is actually sent.
+            # Tools may hand back JSON they already encoded; it is used as the text unchanged.
+            if isinstance(result, (bytes, bytearray, memoryview)):
+                text = bytes(result).decode()
+            else:
+                text = dumps_result_text(result)
+            logger.debug("📊 Result summary: %d characters", len(text))
+            
+            result_bytes = orjson.dumps({
                 "content": [
                     {
                         "type": "text",
-                        "text": json.dumps(result, indent=2, default=str)
+                        "text": text
                     }
                 ]
             })
+            failed = isinstance(result, dict) and "error" in result  # Never remembered
+            if name == "list_datasets":
+                if not failed:
+                    self._list_datasets_cache[bool(arguments.get("include_stats", False))] = (time.monotonic(), result_bytes)
+            elif cache_key is not None and not failed:
+                self._store_tool_result(cache_key, result_bytes)
+            elif holiday_key is not None and not failed:
+                await self._store_holiday(holiday_key, result_bytes, holiday_ttl)
+            return self._envelope_ok(request_id, result_bytes)
                 
         except Exception as e:
             # Send error notification if streaming is enabled
             if progress:
                 await progress.update(f"Error in {name}: {str(e)}", None)
                 
-            logger.error(f"❌ Error in tool {name}: {str(e)}")
-            import traceback
-            logger.error(f"❌ Tool error traceback: {traceback.format_exc()}")
+            logger.exception("❌ Error in tool %s: %s", name, e)
             return self.create_error(request_id, -32603, f"Internal error: {str(e)}")
+        finally:
+            if progress is not None:
+                self._progress_pool.append(progress)
     
-    async def handle_request(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def _drain_result_chunks(self, chunks: AsyncIterator[List[Any]],
+                                   progress: Optional[StreamingProgress]) -> Dict[str, Any]:
+        """Consume a tool that yields row batches.
+        
+        Every row goes in the final result; with streaming enabled each batch is also
+        announced by a progress notification as it is read.
+        """
+        rows: List[Any] = []
+        chunk_count = 0
+        async for batch in chunks:
+            rows.extend(batch)
+            if progress:
+                await progress.chunk(len(batch), chunk_count, len(rows))
+            chunk_count += 1
+        
+        return {"record_count": len(rows), "data": rows}
+    
+    async def handle_request(self, request: Dict[str, Any]) -> Optional[Union[Dict[str, Any], bytes]]:
         """Handle a JSON-RPC request"""
+        # Anything that is not an object with a string method is not a request at all
+        if type(request) is not dict:
+            return self.create_error(None, -32600, "Invalid Request")
         method = request.get("method")
+        if type(method) is not str:
+            return self.create_error(request.get("id"), -32600, "Invalid Request")
+        # Notifications never get a response; drop them before any further work
+        if "id" not in request and method.startswith("notifications/"):
+            logger.debug("Received notification: %s", method)
+            return None
+        # Interned so the method_dispatch probe compares by identity
+        method = sys.intern(method)
         request_id = request.get("id")
-        params = request.get("params", {})
+        params = request.get("params")
+        if params is None:
+            params = _NO_PARAMS
+        elif type(params) is not dict:
+            # By-position arrays and scalars are not accepted by any method here
+            return self.create_error(request_id, -32600, "Invalid Request")
         
-        logger.info(f"📨 Received request - Method: {method}, ID: {request_id}")
-        logger.info(f"📋 Request params: {json.dumps(params, indent=2) if params else 'None'}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📨 Received request - Method: %s, ID: %s", method, request_id)
+            logger.debug("📋 Request params: %s", orjson.dumps(params).decode() if params else 'None')
         
-        if method == "initialize":
-            logger.info("🚀 Handling initialization request")
-            return self.handle_initialize(request_id, params)
-        elif method == "notifications/initialized":
-            # This is a notification, no response needed
-            logger.info("✅ Received initialized notification")
-            return None
-        elif method == "tools/list":
-            logger.info("🔧 Handling tools/list request")
-            return self.handle_list_tools(request_id, params)
-        elif method == "tools/call":
-            tool_name = params.get("name", "unknown")
-            tool_args = params.get("arguments", {})
-            logger.info(f"⚙️  Handling tools/call - Tool: {tool_name}")
-            logger.info(f"🎯 Tool arguments: {json.dumps(tool_args, indent=2)}")
-            return await self.handle_call_tool(request_id, params)
-        elif method == "prompts/list":
-            logger.info("📝 Handling prompts/list request")
-            return self.handle_list_prompts(request_id, params)
-        elif method == "prompts/get":
-            prompt_name = params.get("name", "unknown")
-            logger.info(f"📝 Handling prompts/get - Prompt: {prompt_name}")
-            return await self.handle_get_prompt(request_id, params)
-        elif method == "resources/list":
-            logger.info("📚 Handling resources/list request")
-            return self.handle_list_resources(request_id, params)
-        elif method == "resources/read":
-            resource_uri = params.get("uri", "unknown")
-            logger.info(f"📚 Handling resources/read - URI: {resource_uri}")
-            return await self.handle_read_resource(request_id, params)
-        else:
+        handler = self.method_dispatch.get(method)
+        if handler is None:
             logger.warning(f"❌ Unknown method: {method}")
             return self.create_error(request_id, -32601, f"Method not found: {method}")
+        
+        response = handler(request_id, params)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+    
+    async def _open_stdin_reader(self) -> Optional[asyncio.StreamReader]:
+        """Attach an asyncio StreamReader to stdin, or None if stdin is not pollable"""
+        # Regular files (e.g. `< requests.jsonl`) cannot be registered with the event loop,
+        # and uvloop aborts outright instead of raising, so check before connecting
+        if not is_pollable(sys.stdin):
+            logger.info("stdin is not a pipe, falling back to threaded reads")
+            return None
+        
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+        protocol = asyncio.StreamReaderProtocol(reader)
+        try:
+            await loop.connect_read_pipe(lambda: protocol, sys.stdin.buffer)
+        except (ValueError, OSError) as e:
+            logger.info(f"stdin is not a pipe ({e}), falling back to threaded reads")
+            return None
+        return reader
+    
+    async def _open_stdout_writer(self) -> Optional[asyncio.StreamWriter]:
+        """Attach an asyncio StreamWriter to stdout, or None if stdout is not pollable"""
+        if not is_pollable(sys.stdout):
+            logger.info("stdout is not a pipe, falling back to blocking writes")
+            return None
+        
+        loop = asyncio.get_running_loop()
+        try:
+            transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout.buffer)
+        except (ValueError, OSError) as e:
+            logger.info(f"stdout is not a pipe ({e}), falling back to blocking writes")
+            return None
+        # A zero high-water mark makes drain() wait until each message is fully flushed,
+        # matching the old print(..., flush=True) semantics
+        transport.set_write_buffer_limits(high=0)
+        return asyncio.StreamWriter(transport, protocol, None, loop)
+    
+    async def _handle_and_write(self, request: Dict[str, Any], semaphore: asyncio.Semaphore):
+        """Handle one parsed request and write its response, releasing its in-flight slot"""
+        try:
+            response = await self.handle_request(request)
+            
+            # Send response if needed
+            if response:
+                try:
+                    # Handlers may return a pre-assembled envelope
+                    response_bytes = response if isinstance(response, bytes) else orjson.dumps(response)
+                    await self._write_message(response_bytes)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("📤 Sending response: %s", response_bytes.decode())
+                except (TypeError, ValueError) as e:
+                    logger.error(f"❌ JSON serialization error: {e}")
+                    await self._write_message(self._envelope_err(request.get('id'), -32603, f"JSON serialization error: {str(e)}"))
+            else:
+                logger.debug("📤 No response needed (notification)")
+        except Exception as e:
+            logger.exception("❌ Error handling request: %s", e)
+            await self._write_message(self._envelope_err(None, -32603, "Internal error"))
+        finally:
+            semaphore.release()
     
     async def run(self):
         """Run the server with stdio"""
         logger.info("Starting Forestrat MCP server")
         
+        semaphore = asyncio.Semaphore(MCP_MAX_INFLIGHT)
+        pending: Set[asyncio.Task] = set()
+        
         try:
+            reader = await self._open_stdin_reader()
+            self._stdout_writer = await self._open_stdout_writer()
+            loop = asyncio.get_running_loop()
+            
             while True:
-                # Read line from stdin
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, sys.stdin.readline
-                )
+                # Read raw bytes from stdin; orjson parses them without a decode step
+                if reader is not None:
+                    line = await read_line(reader)
+                else:
+                    line = await loop.run_in_executor(None, sys.stdin.buffer.readline)
                 
+                if line is None:
+                    logger.error("❌ Request line longer than %d bytes discarded", STDIN_LINE_LIMIT)
+                    await self._write_message(self._envelope_err(None, -32600, "Invalid Request: line too long"))
+                    continue
                 if not line:
                     break
                 
                 try:
                     # Parse JSON request
-                    request = json.loads(line.strip())
-                    logger.info(f"📥 Raw request received: {line.strip()}")
-                    
-                    # Handle request
-                    response = await self.handle_request(request)
-                    
-                    # Send response if needed
-                    if response:
-                        try:
-                            response_json = json.dumps(response, ensure_ascii=True, separators=(',', ':'))
-                            print(response_json, flush=True)
-                            logger.info(f"📤 Sending response: {response_json}")
-                        except (TypeError, ValueError) as e:
-                            logger.error(f"❌ JSON serialization error: {e}")
-                            error_response = self.create_error(request.get('id'), -32603, f"JSON serialization error: {str(e)}")
-                            error_json = json.dumps(error_response, ensure_ascii=True, separators=(',', ':'))
-                            print(error_json, flush=True)
-                    else:
-                        logger.info("📤 No response needed (notification)")
-                        
+                    request = orjson.loads(line)
                 except json.JSONDecodeError as e:
                     logger.error(f"❌ Invalid JSON received: {e}")
-                    logger.error(f"❌ Raw line: {line.strip()}")
-                    error_response = self.create_error(None, -32700, "Parse error")
-                    error_json = json.dumps(error_response, ensure_ascii=True, separators=(',', ':'))
-                    print(error_json, flush=True)
-                except Exception as e:
-                    logger.error(f"❌ Error handling request: {e}")
-                    import traceback
-                    logger.error(f"❌ Traceback: {traceback.format_exc()}")
-                    error_response = self.create_error(None, -32603, "Internal error")
-                    error_json = json.dumps(error_response, ensure_ascii=True, separators=(',', ':'))
-                    print(error_json, flush=True)
+                    logger.error(f"❌ Raw line: {line.decode(errors='replace').strip()}")
+                    await self._write_message(self._envelope_err(None, -32700, "Parse error"))
+                    continue
+                
+                # Notifications never get a reply; skip the in-flight slot and task for them.
+                # Parsed first, so a truncated line still gets its -32700
+                if is_notification(request):
+                    continue
+                
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📥 Raw request received: %s", line.decode(errors='replace').strip())
+                
+                # Stop reading while MCP_MAX_INFLIGHT requests are already running
+                await semaphore.acquire()
+                task = asyncio.create_task(self._handle_and_write(request, semaphore))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            
+            # Let in-flight requests finish before shutting down
+            if pending:
+                await asyncio.gather(*pending)
                     
         except KeyboardInterrupt:
             logger.info("Server shutting down...")
@@ -1461,6 +1892,16 @@ class ForestratMCPServer:
             logger.error(f"Server error: {e}")
             raise
         finally:
+            self._flush_stdout()
+            if self._stdout_writer is not None:
+                try:
+                    await self._stdout_writer.drain()
+                except (ConnectionError, OSError):
+                    pass
+                self._stdout_writer.close()
+                self._stdout_writer = None
+            if self._holiday_disk_cache not in (None, False):
+                self._holiday_disk_cache.close()
             try:
                 self.db.close()
             except:
@@ -1522,4 +1963,10 @@ async def main():
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional; it replaces the pure-Python selector loop with libuv when installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -7,20 +7,90 @@ issues in the MCP library decorators.
 """
 
 import asyncio
-import json
+import os
 import sys
 import logging
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import orjson
+
+from stdio_transport import STDIN_LINE_LIMIT, is_notification, is_pollable, read_line
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Static results are serialized once; handlers only splice in the request id
+INITIALIZE_RESULT_BYTES = orjson.dumps({
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "mcp-simple",
+        "version": "1.0.0"
+    }
+})
+
+TOOLS_LIST: List[Dict[str, Any]] = [
+    {
+        "name": "echo",
+        "description": "Echo back the input message",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "Message to echo back"
+                }
+            },
+            "required": ["message"]
+        }
+    },
+    {
+        "name": "add",
+        "description": "Add two numbers together", 
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "number",
+                    "description": "First number"
+                },
+                "b": {
+                    "type": "number",
+                    "description": "Second number"
+                }
+            },
+            "required": ["a", "b"]
+        }
+    },
+    {
+        "name": "get_time",
+        "description": "Get current timestamp",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "additionalProperties": False
+        }
+    }
+]
+
+TOOLS_LIST_RESULT_BYTES = orjson.dumps({"tools": TOOLS_LIST})
+
+
 class SimpleMCPServer:
     """Simple JSON-RPC MCP Server implementation"""
     
     def __init__(self):
         self.initialized = False
+        self._stdout_fd = sys.stdout.fileno()
+        self.method_dispatch = {
+            "initialize": self.handle_initialize,
+            "tools/list": self.handle_list_tools,
+            "tools/call": self.handle_call_tool,
+        }
         logger.info("Simple MCP Server initialized")
     
     def create_response(self, request_id: Optional[Any], result: Any) -> Dict[str, Any]:
@@ -31,6 +101,10 @@ class SimpleMCPServer:
             "result": result
         }
     
+    def _envelope_ok(self, request_id: Optional[Any], result_bytes: bytes) -> bytes:
+        """Assemble a serialized JSON-RPC response around an already-encoded result"""
+        return b''.join((b'{"jsonrpc":"2.0","id":', orjson.dumps(request_id), b',"result":', result_bytes, b'}'))
+    
     def create_error(self, request_id: Optional[Any], code: int, message: str) -> Dict[str, Any]:
         """Create a JSON-RPC error response"""
         return {
@@ -42,83 +116,30 @@ class SimpleMCPServer:
             }
         }
     
-    def handle_initialize(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_initialize(self, request_id: Any, params: Dict[str, Any]) -> bytes:
         """Handle initialize request"""
         logger.info("Handling initialize request")
         self.initialized = True
         
-        return self.create_response(request_id, {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {
-                "tools": {}
-            },
-                         "serverInfo": {
-                 "name": "mcp-simple",
-                 "version": "1.0.0"
-             }
-        })
+        return self._envelope_ok(request_id, INITIALIZE_RESULT_BYTES)
     
-    def handle_list_tools(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_list_tools(self, request_id: Any, params: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
         """Handle tools/list request"""
-        logger.info("Handling tools/list request")
+        logger.debug("Handling tools/list request")
         
         if not self.initialized:
             return self.create_error(request_id, -32002, "Server not initialized")
         
-        tools = [
-            {
-                "name": "echo",
-                "description": "Echo back the input message",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "message": {
-                            "type": "string",
-                            "description": "Message to echo back"
-                        }
-                    },
-                    "required": ["message"]
-                }
-            },
-            {
-                "name": "add",
-                "description": "Add two numbers together", 
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "a": {
-                            "type": "number",
-                            "description": "First number"
-                        },
-                        "b": {
-                            "type": "number",
-                            "description": "Second number"
-                        }
-                    },
-                    "required": ["a", "b"]
-                }
-            },
-            {
-                "name": "get_time",
-                "description": "Get current timestamp",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {},
-                    "additionalProperties": False
-                }
-            }
-        ]
-        
-        return self.create_response(request_id, {
-            "tools": tools
-        })
+        return self._envelope_ok(request_id, TOOLS_LIST_RESULT_BYTES)
     
     def handle_call_tool(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle tools/call request"""
         name = params.get("name")
         arguments = params.get("arguments", {})
         
-        logger.info(f"Handling tool call: {name} with arguments: {arguments}")
+        logger.info("Handling tool call: %s", name)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tool arguments: %s", orjson.dumps(arguments).decode())
         
         if not self.initialized:
             return self.create_error(request_id, -32002, "Server not initialized")
@@ -149,8 +170,7 @@ class SimpleMCPServer:
                 })
             
             elif name == "get_time":
-                import datetime
-                now = datetime.datetime.now().isoformat()
+                now = datetime.now().isoformat()
                 return self.create_response(request_id, {
                     "content": [
                         {
@@ -167,63 +187,103 @@ class SimpleMCPServer:
             logger.error(f"Error handling tool call: {e}")
             return self.create_error(request_id, -32603, f"Internal error: {str(e)}")
     
-    async def handle_request(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def handle_request(self, request: Dict[str, Any]) -> Optional[Union[Dict[str, Any], bytes]]:
         """Handle a JSON-RPC request"""
+        # Anything that is not an object with a string method is not a request at all
+        if type(request) is not dict:
+            return self.create_error(None, -32600, "Invalid Request")
         method = request.get("method")
         request_id = request.get("id")
-        params = request.get("params", {})
+        params = request.get("params")
+        if params is None:
+            params = {}
+        if type(method) is not str or type(params) is not dict:
+            return self.create_error(request_id, -32600, "Invalid Request")
         
-        logger.info(f"Handling request: {method}")
+        logger.debug("Handling request: %s", method)
         
-        if method == "initialize":
-            return self.handle_initialize(request_id, params)
-        elif method == "notifications/initialized":
+        handler = self.method_dispatch.get(method)
+        if handler is not None:
+            return handler(request_id, params)
+        if method == "notifications/initialized":
             # This is a notification, no response needed
             logger.info("Received initialized notification")
             return None
-        elif method == "tools/list":
-            return self.handle_list_tools(request_id, params)
-        elif method == "tools/call":
-            return self.handle_call_tool(request_id, params)
+        return self.create_error(request_id, -32601, f"Method not found: {method}")
+    
+    async def _open_stdin_reader(self) -> Optional[asyncio.StreamReader]:
+        """Attach an asyncio StreamReader to stdin, or None if stdin is not pollable"""
+        # Regular files (e.g. `< requests.jsonl`) cannot be registered with the event loop
+        if not is_pollable(sys.stdin):
+            logger.info("stdin is not a pipe, falling back to threaded reads")
+            return None
+        
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+        protocol = asyncio.StreamReaderProtocol(reader)
+        try:
+            await loop.connect_read_pipe(lambda: protocol, sys.stdin.buffer)
+        except (ValueError, OSError) as e:
+            logger.info(f"stdin is not a pipe ({e}), falling back to threaded reads")
+            return None
+        return reader
+    
+    def _write_message(self, response: Union[Dict[str, Any], bytes]):
+        """Write one newline-framed JSON-RPC message to stdout"""
+        # Static handlers hand back their response already serialized
+        if isinstance(response, bytes):
+            payload = response
         else:
-            return self.create_error(request_id, -32601, f"Method not found: {method}")
+            payload = orjson.dumps(response, default=str, option=orjson.OPT_NON_STR_KEYS)
+        # orjson output is already UTF-8, so it goes straight to the fd without the text layer
+        view = memoryview(payload + b"\n")
+        while view:
+            view = view[os.write(self._stdout_fd, view):]
+        logger.debug("Sent response: %s", payload)
     
     async def run(self):
         """Run the server with stdio"""
         logger.info("Starting simple MCP server")
         
         try:
+            reader = await self._open_stdin_reader()
+            loop = asyncio.get_running_loop()
+            
             while True:
-                # Read line from stdin
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, sys.stdin.readline
-                )
+                # Read raw bytes from stdin; orjson parses them without a decode step
+                if reader is not None:
+                    line = await read_line(reader)
+                else:
+                    line = await loop.run_in_executor(None, sys.stdin.buffer.readline)
                 
+                if line is None:
+                    logger.error("Request line longer than %d bytes discarded", STDIN_LINE_LIMIT)
+                    self._write_message(self.create_error(None, -32600, "Invalid Request: line too long"))
+                    continue
                 if not line:
                     break
                 
                 try:
                     # Parse JSON request
-                    request = json.loads(line.strip())
-                    logger.debug(f"Received request: {request}")
+                    request = orjson.loads(line)
+                    # Notifications never get a reply; parsed first so a truncated line gets -32700
+                    if is_notification(request):
+                        continue
+                    logger.debug("Received request: %s", request)
                     
                     # Handle request
                     response = await self.handle_request(request)
                     
                     # Send response if needed
                     if response:
-                        response_json = json.dumps(response)
-                        print(response_json, flush=True)
-                        logger.debug(f"Sent response: {response_json}")
+                        self._write_message(response)
                         
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     logger.error(f"Invalid JSON: {e}")
-                    error_response = self.create_error(None, -32700, "Parse error")
-                    print(json.dumps(error_response), flush=True)
+                    self._write_message(self.create_error(None, -32700, "Parse error"))
                 except Exception as e:
                     logger.error(f"Error handling request: {e}")
-                    error_response = self.create_error(None, -32603, "Internal error")
-                    print(json.dumps(error_response), flush=True)
+                    self._write_message(self.create_error(None, -32603, "Internal error"))
                     
         except KeyboardInterrupt:
             logger.info("Server shutting down...")
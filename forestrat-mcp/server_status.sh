@@ -37,6 +37,22 @@ else
 fi
 echo ""
 
+# Function to print the last N log entries; the server logs NDJSON, rendered here one line each
+show_log_tail() {
+    tail -n "$1" forestrat_mcp_server.log | python3 -c '
+import json, sys, time
+for line in sys.stdin:
+    try:
+        entry = json.loads(line)
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["t"]))
+        print("%s - %s - %s - %s" % (stamp, entry["name"], entry["lvl"], entry["msg"]))
+        if "exc" in entry:
+            print(entry["exc"])
+    except (ValueError, KeyError, TypeError):
+        print(line, end="")  # Plain-text logs from other server files
+' 2>/dev/null || tail -n "$1" forestrat_mcp_server.log
+}
+
 # Function to show detailed process status
 show_detailed_status() {
     PIDS=$(pgrep -f "$SERVER_FILE" || true)
@@ -66,7 +82,7 @@ show_detailed_status() {
         if [ -f "forestrat_mcp_server.log" ]; then
             echo "📝 Recent Log Entries (last 10 lines):"
             echo "----------------------------------------"
-            tail -10 forestrat_mcp_server.log
+            show_log_tail 10
             echo "----------------------------------------"
             echo "📂 Full log file: forestrat_mcp_server.log"
         else
@@ -82,7 +98,7 @@ show_detailed_status() {
             echo ""
             echo "📝 Last Log Entries (last 5 lines):"
             echo "------------------------------------"
-            tail -5 forestrat_mcp_server.log
+            show_log_tail 5
             echo "------------------------------------"
         fi
     fi
@@ -133,7 +149,7 @@ show_quick_commands() {
     echo "Stop Server:          ./stop_server.sh"
     echo "Check Status (Prod):  ./server_status.sh"
     echo "Check Status (Dev):   ./server_status.sh --dev"
-    echo "View Logs:            tail -f forestrat_mcp_server.log"
+    echo "View Logs (NDJSON):   tail -f forestrat_mcp_server.log"
     echo "Test Server:          python3 test_activity_fixed.py"
 }
 
@@ -0,0 +1,54 @@
+"""
+Stdio helpers shared by the JSON-RPC MCP servers
+
+Both main_fixed.py and mcp_simple.py read newline-framed requests from stdin;
+the line limit and the framing rules live here so the two stay in step.
+"""
+
+import asyncio
+import os
+import stat
+from typing import Any, Optional
+
+# Upper bound for a single JSON-RPC line read from stdin
+STDIN_LINE_LIMIT = 16 * 1024 * 1024
+
+
+def is_pollable(stream) -> bool:
+    """Whether a stdio stream can be attached to the event loop (pipes, sockets, ttys)"""
+    try:
+        mode = os.fstat(stream.fileno()).st_mode
+    except (OSError, ValueError):
+        return False
+    # Character devices other than ttys (e.g. /dev/null) behave like regular files
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or (stat.S_ISCHR(mode) and stream.isatty())
+
+
+async def read_line(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Read one line from reader: b'' at EOF, None if the line exceeded the reader's limit.
+    
+    The rest of an oversized line is read and dropped so the next call starts on a fresh line.
+    """
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as e:
+        return e.partial  # Unterminated last line, or b'' at EOF
+    except asyncio.LimitOverrunError as e:
+        consumed = e.consumed
+    while True:
+        try:
+            await reader.readexactly(consumed)
+            await reader.readuntil(b'\n')
+            return None
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+        except asyncio.IncompleteReadError:
+            return None
+
+
+def is_notification(message: Any) -> bool:
+    """Whether a parsed JSON-RPC message is a notification, which never gets a reply"""
+    if type(message) is not dict or "id" in message:
+        return False
+    method = message.get("method")
+    return type(method) is str and method.startswith("notifications/")
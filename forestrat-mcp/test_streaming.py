@@ -8,10 +8,18 @@ during long-running operations.
 
 import asyncio
 import json
+import os
 import sys
 import subprocess
+import tempfile
 from typing import Dict, Any, Optional
 
+import duckdb
+
+import database
+from database import DuckDBConnection
+from main import _encode_batches
+
 class StreamingMCPClient:
     """Simple MCP client to test streaming functionality"""
     
@@ -165,11 +173,163 @@ class StreamingMCPClient:
             self.process.terminate()
             await self.process.wait()
 
+async def test_database_pool() -> bool:
+    """Check the DuckDBConnection cursor pool on a scratch database"""
+    print("🔧 Testing DuckDBConnection cursor pool")
+    ok = True
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "scratch.duckdb")
+        with duckdb.connect(db_path) as conn:
+            conn.execute("CREATE TABLE trades AS SELECT range AS n, 'BTCF25' AS symbol FROM range(25000)")
+        
+        db = DuckDBConnection(db_path, pool_size=2)
+        try:
+            # More concurrent borrowers than cursors: at most pool_size hold one at a time
+            holders = 0
+            max_holders = 0
+            seen_cursors = set()
+            
+            async def borrow():
+                nonlocal holders, max_holders
+                async with db.acquire_cursor_async() as cursor:
+                    holders += 1
+                    max_holders = max(max_holders, holders)
+                    seen_cursors.add(id(cursor))
+                    await asyncio.sleep(0.01)
+                    row = cursor.execute("SELECT COUNT(*) FROM trades").fetchone()
+                    holders -= 1
+                    return row[0]
+            
+            counts = await asyncio.gather(*(borrow() for _ in range(8)))
+            passed = (counts == [25000] * 8 and max_holders == 2 and len(seen_cursors) == 2
+                      and db._cursor_pool.qsize() == 2)
+            print(f"{'✓' if passed else '❌'} Pool: 8 borrowers, {max_holders} concurrent, "
+                  f"{len(seen_cursors)} cursors, {db._cursor_pool.qsize()} returned")
+            ok = ok and passed
+            
+            # A synchronous query on the loop thread while async holders have drained the pool
+            # must not wait for them: they can only release once the loop runs again
+            async with db.acquire_cursor_async(), db.acquire_cursor_async():
+                row = db.execute_query_arrow("SELECT COUNT(*) AS c FROM trades").to_pylist()
+            passed = (row == [{"c": 25000}] and not db._extra_cursors
+                      and db._cursor_pool.qsize() == 2 and len(db._pool_cursors) == 2)
+            print(f"{'✓' if passed else '❌'} Sync query on the loop thread with the pool drained")
+            ok = ok and passed
+            
+            # close() reaches cursors that are still checked out
+            async with db.acquire_cursor_async() as held:
+                db.close()
+                try:
+                    held.execute("SELECT 1")
+                    passed = False
+                except Exception:
+                    passed = True
+            passed = passed and not db._pool_cursors and db._cursor_pool.qsize() == 0
+            print(f"{'✓' if passed else '❌'} close() closes checked-out cursors")
+            ok = ok and passed
+        finally:
+            db.close()
+    
+    return ok
+
+async def test_stream_batches() -> bool:
+    """Check stream_query_async and the per-batch JSON encoding on a scratch database"""
+    print("🔧 Testing streamed record batches")
+    ok = True
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "scratch.duckdb")
+        with duckdb.connect(db_path) as conn:
+            conn.execute("CREATE TABLE trades AS SELECT range AS n, 'BTCF25' AS symbol FROM range(25000)")
+        
+        db = DuckDBConnection(db_path, pool_size=2)
+        try:
+            batches = [batch async for batch in db.stream_query_async("SELECT * FROM trades ORDER BY n",
+                                                                      batch_size=10000)]
+            rows = [row["n"] for batch in batches for row in batch.to_pylist()]
+            passed = len(batches) >= 3 and rows == list(range(25000))
+            print(f"{'✓' if passed else '❌'} Stream: {len(rows)} rows in {len(batches)} ordered batches")
+            ok = ok and passed
+            
+            empty = [batch async for batch in db.stream_query_async("SELECT n, symbol FROM trades WHERE n < 0")]
+            passed = (len(empty) == 1 and empty[0].num_rows == 0
+                      and empty[0].schema.names == ["n", "symbol"])
+            print(f"{'✓' if passed else '❌'} Empty stream yields one zero-row batch with the column names")
+            ok = ok and passed
+            
+            count, columns, data = await _encode_batches(
+                db.stream_query_async("SELECT n FROM trades WHERE n < 3 ORDER BY n"))
+            passed = (count == 3 and columns == ["n"]
+                      and json.loads(data) == [{"n": 0}, {"n": 1}, {"n": 2}])
+            print(f"{'✓' if passed else '❌'} Batches are encoded to one JSON array")
+            ok = ok and passed
+            
+            count, columns, data = await _encode_batches(
+                db.stream_query_async("SELECT n, symbol FROM trades WHERE n < 0"))
+            passed = count == 0 and columns == ["n", "symbol"] and data == "[]"
+            print(f"{'✓' if passed else '❌'} Empty result encodes to [] and keeps the column names")
+            ok = ok and passed
+            
+            passed = db._cursor_pool.qsize() == len(db._pool_cursors)
+            print(f"{'✓' if passed else '❌'} Streamed cursors returned to the pool")
+            ok = ok and passed
+        finally:
+            db.close()
+    
+    return ok
+
+async def test_schema_cache() -> bool:
+    """Check table-name quoting and the bounded DESCRIBE/column caches on a scratch database"""
+    print("🔧 Testing table schema lookups")
+    ok = True
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "scratch.duckdb")
+        with duckdb.connect(db_path) as conn:
+            conn.execute("CREATE SCHEMA bronze")
+            for n in range(4):
+                conn.execute(f"CREATE TABLE bronze.t{n} AS SELECT {n} AS n")
+        
+        db = DuckDBConnection(db_path, pool_size=2)
+        original_size = database.SCHEMA_CACHE_SIZE
+        database.SCHEMA_CACHE_SIZE = 2
+        try:
+            passed = [row["column_name"] for row in db.describe_table("bronze.t0")] == ["n"]
+            print(f"{'✓' if passed else '❌'} Schema-qualified names are described")
+            ok = ok and passed
+            
+            try:
+                db.describe_table("bronze.t0; DROP TABLE bronze.t1")
+                passed = False
+            except Exception:
+                passed = db.table_exists("bronze.t1")
+            print(f"{'✓' if passed else '❌'} A table name cannot smuggle in another statement")
+            ok = ok and passed
+            
+            for n in range(4):
+                db.get_table_columns(f"bronze.t{n}")
+            db.describe_table("bronze.t2")
+            passed = (list(db._describe_cache) == ["bronze.t3", "bronze.t2"]
+                      and list(db._columns_cache) == ["bronze.t2", "bronze.t3"])
+            print(f"{'✓' if passed else '❌'} Schema caches keep the {database.SCHEMA_CACHE_SIZE} most recently used tables")
+            ok = ok and passed
+        finally:
+            database.SCHEMA_CACHE_SIZE = original_size
+            db.close()
+    
+    return ok
+
 async def main():
     """Main test function"""
     print("🚀 Starting MCP Streaming Test")
     print("=" * 50)
     
+    # Scratch-database checks; the server tests below run whatever their outcome
+    database_ok = await test_database_pool()
+    database_ok = await test_stream_batches() and database_ok
+    database_ok = await test_schema_cache() and database_ok
+    
     client = StreamingMCPClient()
     
     try:
@@ -223,6 +383,7 @@ async def main():
         traceback.print_exc()
         
     finally:
+        print(f"{'✓' if database_ok else '❌'} DuckDBConnection checks {'passed' if database_ok else 'failed'}")
         await client.cleanup()
 
 if __name__ == "__main__":